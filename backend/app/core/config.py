@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # API Settings
@@ -31,6 +31,51 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str
     PINECONE_ASSISTANT_NAME: str
     
+    # Video Service Settings
+    VIDEO_STORAGE_MODE: str = "per_video"  # "per_video" or "shared"
+    VIDEO_SHARED_TABLE_NAME: str = "video_captions"
+    VIDEO_JOB_WORKERS: int = 2
+    VIDEO_JOB_LEASE_SECONDS: float = 60.0  # Running jobs without a heartbeat for this long are reclaimed
+    VIDEO_QUERY_THREADS: int = 8
+    VIDEO_INGEST_THREADS: int = 2
+    VIDEO_BULK_CONCURRENCY: int = 3
+    VIDEO_BULK_MAX_CONCURRENCY: int = 8
+    VIDEO_NORMALIZE_CAPTIONS: bool = True
+    VIDEO_CAPTION_MAX_CHARS: int = 300
+    VIDEO_CAPTION_MAX_SECONDS: float = 15.0
+    VIDEO_CAPTION_MAX_GAP_SECONDS: float = 2.0
+    VIDEO_CHUNK_WINDOW_SECONDS: float = 300.0
+    VIDEO_CHUNK_OVERLAP_SECONDS: float = 0.0
+    VIDEO_TRANSCRIPT_CACHE_BYTES: int = 512 * 1024 * 1024  # 0 disables the transcript cache
+    VIDEO_TABLE_CACHE_ENTRIES: int = 256  # 0 reopens the LanceDB table on every query
+    VIDEO_READ_CONSISTENCY_SECONDS: float = 0.0  # How stale a cached table handle may get, negative never re-checks
+    VIDEO_PREFETCH_MAX_INFLIGHT: int = 4  # 0 disables warm-up when a video is opened
+    VIDEO_LIBRARY_SEARCH_TIMEOUT_SECONDS: float = 2.0
+    VIDEO_LIBRARY_OVERFETCH: int = 4
+    VIDEO_LIBRARY_SEARCH_CONCURRENCY: int = 0  # Per-video tables searched at once, 0 uses half of VIDEO_QUERY_THREADS
+    VIDEO_SUMMARIZE_ON_INGEST: bool = False
+    VIDEO_SUMMARY_CONCURRENCY: int = 4
+    VIDEO_CONTEXT_TOKEN_BUDGET: int = 800  # 0 sends the whole chunk window
+    VIDEO_TIMELINE_CACHE_BYTES: int = 64 * 1024 * 1024
+    VIDEO_ANSWER_CACHE_MAX_ENTRIES: int = 5000  # 0 disables the answer cache
+    VIDEO_ANSWER_CACHE_THRESHOLD: float = 0.92
+    VIDEO_ANSWER_CACHE_TTL_SECONDS: float = 3600.0
+    VIDEO_ENCODER_MODEL: str = "all-MiniLM-L6-v2"
+    VIDEO_ENCODER_BACKEND: str = "torch"  # "torch", "torch-int8" or "onnx-int8"
+    VIDEO_EMBEDDING_BATCH_SIZE: int = 64
+    VIDEO_EMBEDDING_WORKERS: int = 0  # Encoder processes for ingestion, 0 encodes in-process
+    VIDEO_EMBEDDING_TORCH_THREADS: int = 1  # Intra-op threads per encoder process
+    VIDEO_EMBEDDING_POOL_MIN_TEXTS: int = 256  # Smaller inputs are encoded in-process
+    VIDEO_INGEST_BATCH_ROWS: int = 2048  # Captions embedded and appended to LanceDB per batch
+    VIDEO_CHUNK_WRITE_BATCH: int = 100  # Chunk documents per MongoDB insert
+    VIDEO_RETRIEVAL_MODE: str = "fts"  # "fts", "vector" or "hybrid"
+    VIDEO_HYBRID_CANDIDATES: int = 20
+    VIDEO_RRF_K: int = 60
+    VIDEO_ANN_INDEX_MIN_ROWS: int = 5000
+    VIDEO_ANN_RETRAIN_GROWTH: float = 0.25  # Shared table growth that triggers an IVF-PQ retrain
+    VIDEO_ANN_NPROBES: int = 20
+    VIDEO_ANN_REFINE_FACTOR: Optional[int] = None
+
     # Environment Settings
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
 
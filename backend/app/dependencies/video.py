@@ -0,0 +1,90 @@
+from fastapi import HTTPException, status
+from typing import Optional
+import asyncio
+import logging
+from ..services.video_service import VideoService
+from ..services.video_jobs import VideoJobQueue
+
+logger = logging.getLogger(__name__)
+
+class VideoServiceRegistry:
+    """Holds the process-wide VideoService and ingestion queue created during application startup."""
+
+    def __init__(self):
+        self._service: Optional[VideoService] = None
+        self._job_queue: Optional[VideoJobQueue] = None
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def startup(self):
+        """Load the encoder and LanceDB connection once and warm them up."""
+        if self._service is not None:
+            logger.info("VideoService already initialized")
+            return
+
+        logger.info("Initializing shared VideoService...")
+        # Model loading and the warm-up encode are CPU bound, keep them off the event loop
+        service = await asyncio.to_thread(VideoService)
+        await asyncio.to_thread(service.warm_up)
+        try:
+            await service.ensure_indexes()
+        except Exception:
+            # MongoDB may be temporarily unreachable; queries still work without indexes
+            logger.warning("Continuing startup without MongoDB indexes")
+
+        job_queue = VideoJobQueue(service)
+        await job_queue.start()
+
+        self._service = service
+        self._job_queue = job_queue
+        self._ready = True
+        logger.info("Shared VideoService is ready")
+
+    async def shutdown(self):
+        self._ready = False
+        if self._job_queue is not None:
+            await self._job_queue.stop()
+        self._job_queue = None
+        if self._service is not None:
+            self._service.close()
+        self._service = None
+        logger.info("Shared VideoService released")
+
+    def get(self) -> VideoService:
+        if not self._ready or self._service is None:
+            raise RuntimeError("VideoService not initialized. Call startup() first.")
+        return self._service
+
+    def get_job_queue(self) -> VideoJobQueue:
+        if not self._ready or self._job_queue is None:
+            raise RuntimeError("VideoJobQueue not initialized. Call startup() first.")
+        return self._job_queue
+
+video_service_registry = VideoServiceRegistry()
+
+def get_video_service() -> VideoService:
+    """
+    Return the shared VideoService, or 503 while the application is still warming up.
+    """
+    if not video_service_registry.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Video service is warming up, please retry shortly"
+        )
+    return video_service_registry.get()
+
+def get_video_job_queue() -> VideoJobQueue:
+    """
+    Return the shared ingestion queue, or 503 while the application is still warming up.
+    """
+    if not video_service_registry.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Video service is warming up, please retry shortly"
+        )
+    return video_service_registry.get_job_queue()
+
+__all__ = ['VideoServiceRegistry', 'video_service_registry', 'get_video_service', 'get_video_job_queue']
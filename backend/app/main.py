@@ -1,8 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .routes import content, api_router, chatbot, video, web_content
+from .dependencies.video import video_service_registry
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the shared VideoService (encoder, LanceDB) once per process
+    await video_service_registry.startup()
+    yield
+    await video_service_registry.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -33,3 +43,10 @@ app.include_router(web_content.router, prefix="/api/v1")
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Documentation API"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: only reports ready once the VideoService has been warmed up."""
+    if not video_service_registry.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
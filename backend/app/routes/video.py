@@ -1,49 +1,152 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, List
+import json
 from pydantic import BaseModel
-from ..services.video_service import VideoService
+from ..services.video_service import VideoService, RetrievalOptions
+from ..services.video_jobs import VideoJobQueue
+from ..dependencies.video import get_video_service, get_video_job_queue
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
 
 class VideoProcess(BaseModel):
     url: str
+    refresh: bool = False  # Refetch the transcript instead of using the cached copy
+
+class BulkVideoProcess(BaseModel):
+    urls: List[str] = []
+    text: Optional[str] = None  # Newline-delimited URLs, e.g. a pasted playlist export
+    force: bool = False
+    concurrency: Optional[int] = None
 
 class ChatMessage(BaseModel):
     videoId: str
     message: str
+    mode: Optional[str] = None  # "fts", "vector" or "hybrid", defaults to VIDEO_RETRIEVAL_MODE
+    top_k: int = 1
+    nprobes: Optional[int] = None
+    refine_factor: Optional[int] = None
+    rrf_k: Optional[int] = None
+    fts_weight: float = 1.0
+    vector_weight: float = 1.0
 
 class ChatResponse(BaseModel):
     response: str
     timestamp: Optional[float]
     context: Optional[str]
+    timings: Optional[Dict[str, float]] = None
 
-@router.post("/process")
+@router.post("/process", status_code=status.HTTP_202_ACCEPTED)
 async def process_video(
     video: VideoProcess,
-    video_service: VideoService = Depends(VideoService)
+    video_service: VideoService = Depends(get_video_service),
+    job_queue: VideoJobQueue = Depends(get_video_job_queue)
 ):
     """
-    Process a YouTube video URL:
-    1. Extract video ID
-    2. Download and process transcript
-    3. Create vector embeddings for semantic search
-    4. Store 5-minute context chunks
+    Queue a YouTube video URL for processing and return the job id right away.
+    A background worker will:
+    1. Download and process transcript
+    2. Create vector embeddings for semantic search
+    3. Store 5-minute context chunks
+    Poll /api/videos/jobs/{job_id} for progress.
     """
     try:
         video_id = video_service.extract_video_id(video.url)
-        success = await video_service.process_video(video_id, video.url)
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to process video")
-        
-        return {"status": "success", "videoId": video_id}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = await job_queue.enqueue(video_id, video.url, refresh_transcript=video.refresh)
+        return {"status": job["status"], "videoId": video_id, "jobId": job["job_id"]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/process/bulk")
+async def process_videos_bulk(
+    request: BulkVideoProcess,
+    job_queue: VideoJobQueue = Depends(get_video_job_queue)
+):
+    """
+    Process many YouTube URLs through the job queue with bounded concurrency.
+    Streams one NDJSON line per URL as soon as its video finishes.
+    Videos that are already processed are skipped unless `force` is set.
+    """
+    urls = list(request.urls)
+    if request.text:
+        urls.extend(request.text.splitlines())
+    if not any(url.strip() for url in urls):
+        raise HTTPException(status_code=400, detail="No URLs provided")
+    if request.concurrency is not None and request.concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be positive")
+
+    async def results():
+        async for result in job_queue.process_bulk(urls, request.force, request.concurrency):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    job_queue: VideoJobQueue = Depends(get_video_job_queue)
+):
+    """Report the status and stage-level progress of an ingestion job."""
+    job = await job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/stats")
+async def get_cache_stats(
+    video_service: VideoService = Depends(get_video_service)
+):
+    """Report hit/miss counters of the video service caches."""
+    return video_service.get_cache_stats()
+
+@router.get("/search")
+async def search_library(
+    q: str = Query(..., min_length=1),
+    mode: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    per_video: int = Query(1, ge=1, le=10),
+    video_service: VideoService = Depends(get_video_service)
+):
+    """
+    Search every processed video for a topic.
+    Returns ranked hits with video id, title, timestamp and snippet; `partial`
+    is set when some videos could not be searched within the latency target.
+    """
+    try:
+        options = RetrievalOptions(mode=mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return await video_service.search_library(q, options, limit=limit, offset=offset, per_video=per_video)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _retrieval_options(message: ChatMessage) -> RetrievalOptions:
+    try:
+        return RetrievalOptions(
+            mode=message.mode,
+            top_k=message.top_k,
+            nprobes=message.nprobes,
+            refine_factor=message.refine_factor,
+            rrf_k=message.rrf_k,
+            fts_weight=message.fts_weight,
+            vector_weight=message.vector_weight
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     message: ChatMessage,
-    video_service: VideoService = Depends(VideoService)
+    video_service: VideoService = Depends(get_video_service)
 ):
     """
     Chat with the video content:
@@ -52,33 +155,101 @@ async def chat(
     3. Generate response using LLM
     4. Return response with timestamp for video navigation
     """
+    options = _retrieval_options(message)
+
     try:
+        timings: Dict[str, float] = {}
         response, timestamp = await video_service.query_video_content(
             message.videoId,
-            message.message
+            message.message,
+            options,
+            timings
         )
         return ChatResponse(
             response=response,
             timestamp=timestamp,
-            context=None  # Context is handled internally for better responses
+            context=None,  # Context is handled internally for better responses
+            timings=timings
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def chat_stream(
+    message: ChatMessage,
+    video_service: VideoService = Depends(get_video_service)
+):
+    """
+    Chat with the video content over Server-Sent Events:
+    1. `timestamp` event with the anchor timestamp as soon as retrieval finishes
+    2. `token` events with the answer as the LLM generates it
+    3. `done` event with per-stage timings (or an `error` event)
+    """
+    options = _retrieval_options(message)
+
+    async def events():
+        try:
+            async for event in video_service.stream_video_content(
+                message.videoId,
+                message.message,
+                options
+            ):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/")
 async def get_videos(
-    video_service: VideoService = Depends(VideoService)
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    video_service: VideoService = Depends(get_video_service)
 ):
+    """
+    List videos, newest first.
+    With `limit`, `cursor` or `fields` (comma-separated) a page is returned as
+    {items, next_cursor}; pass next_cursor back to get the following page.
+    Without them the full list is returned, as before.
+    """
+    if limit is None and cursor is None and fields is None:
+        try:
+            videos = await video_service.get_all_videos()
+            return videos
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
-        videos = await video_service.get_all_videos()
-        return videos
-    except Exception as e:
+        return await video_service.list_videos(
+            limit=limit or 20,
+            cursor=cursor,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        )
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{video_id}/summary")
+async def get_video_summary(
+    video_id: str,
+    video_service: VideoService = Depends(get_video_service)
+):
+    """Serve the summary and chapters generated at ingestion."""
+    summary = await video_service.get_video_summary(video_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    return summary
 
 @router.get("/{video_id}")
 async def get_video(
     video_id: str,
-    video_service: VideoService = Depends(VideoService)
+    video_service: VideoService = Depends(get_video_service)
 ):
     try:
         video = await video_service.get_video_by_id(video_id)
@@ -0,0 +1,116 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedAnswer:
+    embedding: np.ndarray
+    answer: str
+    timestamp: Optional[float]
+    version: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+class SemanticAnswerCache:
+    """
+    Cache of chat answers keyed by video id and query embedding.
+
+    A query hits when its cosine similarity to a cached query for the same video
+    reaches `threshold`. Embeddings are expected to be L2-normalized, so the
+    similarity is a dot product. Entries expire after `ttl_seconds` and the
+    least recently used entry is evicted beyond `max_entries`. Each answer
+    keeps the video content version it was generated from; a lookup with a
+    different version (the video was reprocessed, possibly by another process)
+    drops the video's entries and misses.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_entries: int):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], CachedAnswer]" = OrderedDict()
+        self._by_video: Dict[str, Dict[int, CachedAnswer]] = {}
+        self._next_key = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _remove(self, key: Tuple[str, int]):
+        self._entries.pop(key, None)
+        video_entries = self._by_video.get(key[0])
+        if video_entries is not None:
+            video_entries.pop(key[1], None)
+            if not video_entries:
+                del self._by_video[key[0]]
+
+    def _expire(self, video_id: str):
+        cutoff = time.monotonic() - self.ttl_seconds
+        stale = [
+            entry_key for entry_key, entry in self._by_video.get(video_id, {}).items()
+            if entry.created_at < cutoff
+        ]
+        for entry_key in stale:
+            self._remove((video_id, entry_key))
+
+    def lookup(self, video_id: str, embedding: np.ndarray, version: Optional[str] = None) -> Optional[CachedAnswer]:
+        self._expire(video_id)
+        if any(entry.version != version for entry in self._by_video.get(video_id, {}).values()):
+            self.invalidate(video_id)
+        video_entries = self._by_video.get(video_id)
+        if not video_entries:
+            self.misses += 1
+            return None
+
+        keys = list(video_entries)
+        matrix = np.stack([video_entries[key].embedding for key in keys])
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end((video_id, keys[best]))
+        self.hits += 1
+        return video_entries[keys[best]]
+
+    def put(
+        self,
+        video_id: str,
+        embedding: np.ndarray,
+        answer: str,
+        timestamp: Optional[float],
+        version: Optional[str] = None
+    ):
+        key = (video_id, self._next_key)
+        self._next_key += 1
+        entry = CachedAnswer(embedding=embedding, answer=answer, timestamp=timestamp, version=version)
+        self._entries[key] = entry
+        self._by_video.setdefault(video_id, {})[key[1]] = entry
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, video_id: str):
+        for entry_key in list(self._by_video.get(video_id, {})):
+            self._remove((video_id, entry_key))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,45 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+
+def caption_hash(caption: Dict) -> str:
+    """Stable short hash of one caption's timing and text."""
+    key = f"{caption['start']:.3f}|{caption['duration']:.3f}|{caption['text']}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_hash(chunk: Dict) -> str:
+    """Stable short hash of one context chunk."""
+    return caption_hash(chunk)
+
+
+def fingerprint_captions(captions: List[Dict]) -> Tuple[List[str], str]:
+    """
+    Fingerprint a caption list.
+
+    Returns:
+        Tuple[List[str], str]: Per-caption hashes in caption order, and a hash of
+        the whole transcript derived from them
+    """
+    hashes = [caption_hash(caption) for caption in captions]
+    transcript = hashlib.sha256()
+    for value in hashes:
+        transcript.update(value.encode("ascii"))
+    return hashes, transcript.hexdigest()
+
+
+def diff_caption_hashes(previous_hashes: List[str], hashes: List[str]) -> Tuple[List[int], List[str]]:
+    """
+    Compare the caption hashes of a new transcript with the stored ones.
+
+    Captions whose hash is already stored are unchanged and left alone.
+
+    Returns:
+        Tuple[List[int], List[str]]: Positions in `hashes` of the captions to
+        add, and the stored hashes no longer present, to remove
+    """
+    previous = set(previous_hashes)
+    current = set(hashes)
+    added = [i for i, digest in enumerate(hashes) if digest not in previous]
+    removed = [digest for digest in dict.fromkeys(previous_hashes) if digest not in current]
+    return added, removed
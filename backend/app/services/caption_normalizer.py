@@ -0,0 +1,109 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Bracketed non-speech annotations such as [Music], [Applause] or [inaudible]
+NOISE_PATTERN = re.compile(r"\[[^\[\]]{0,30}\]|♪+|&gt;&gt;|>>")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+SENTENCE_END = (".", "?", "!")
+
+
+def clean_caption_text(text: str) -> str:
+    """Strip noise tokens and collapse whitespace."""
+    return WHITESPACE_PATTERN.sub(" ", NOISE_PATTERN.sub(" ", text)).strip()
+
+
+def _strip_overlap(previous: str, current: str) -> str:
+    """
+    Remove the words `current` repeats from the end of `previous`.
+
+    Auto-captions roll, so a line often starts with the tail of the line before.
+    Only whole words are compared, so "so" never strips the start of "something".
+    """
+    prev_words = previous.split()
+    words = current.split()
+    if words[:len(prev_words)] == prev_words:
+        # The whole previous line repeats, however short it is
+        return " ".join(words[len(prev_words):])
+
+    # A single shared word is usually legitimate speech, require at least two
+    for size in range(min(len(prev_words), len(words)), 1, -1):
+        if prev_words[-size:] == words[:size]:
+            return " ".join(words[size:])
+    return current
+
+
+def iter_normalized_captions(
+    captions: Iterable[Dict],
+    max_chars: int = 300,
+    max_seconds: float = 15.0,
+    max_gap_seconds: float = 2.0
+) -> Iterator[Dict]:
+    """
+    Merge raw captions into sentence-level rows.
+
+    Noise tokens are stripped, repeated and overlapping text from rolling
+    captions is dropped, and fragments are joined until a sentence ends, the row
+    reaches `max_chars` or `max_seconds`, or there is a pause longer than
+    `max_gap_seconds`. Each row keeps the start of its first caption and a
+    duration running to the end of its last one.
+
+    Args:
+        captions: Caption dicts with 'text', 'start' and 'duration', in time order
+
+    Yields:
+        Dict: Rows with 'text', 'start' and 'duration' keys
+    """
+    parts: List[str] = []
+    start = end = 0.0
+    last_text: Optional[str] = None
+
+    def flush() -> Dict:
+        return {'text': " ".join(parts), 'start': start, 'duration': round(end - start, 3)}
+
+    for caption in captions:
+        text = clean_caption_text(caption['text'])
+        if not text:
+            continue
+        caption_start = caption['start']
+        caption_end = caption_start + caption['duration']
+
+        if last_text is not None:
+            text = _strip_overlap(last_text, text)
+        if not text:
+            # Pure repeat of the previous line, it only extends the time span
+            end = max(end, caption_end)
+            continue
+
+        if parts and caption_start - end > max_gap_seconds:
+            yield flush()
+            parts = []
+
+        if not parts:
+            start = caption_start
+            end = caption_end
+        parts.append(text)
+        end = max(end, caption_end)
+        last_text = clean_caption_text(caption['text'])
+
+        length = sum(len(part) + 1 for part in parts)
+        if text.endswith(SENTENCE_END) or length >= max_chars or end - start >= max_seconds:
+            yield flush()
+            parts = []
+
+    if parts:
+        yield flush()
+
+
+def normalize_captions(captions: List[Dict], **kwargs) -> Tuple[List[Dict], Dict]:
+    """
+    Normalize a caption list and report the row reduction.
+
+    Keyword arguments are passed to iter_normalized_captions.
+    """
+    rows = list(iter_normalized_captions(captions, **kwargs))
+    stats = {
+        'input_rows': len(captions),
+        'output_rows': len(rows),
+        'reduction': round(1 - len(rows) / len(captions), 3) if captions else 0.0
+    }
+    return rows, stats
@@ -0,0 +1,56 @@
+import logging
+from typing import Dict, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional, fall back to a character estimate
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when installed, else estimate ~4 characters per token."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return max(1, len(text) // 4)
+
+
+def format_timestamp(timestamp_ms: int) -> str:
+    seconds = timestamp_ms // 1000
+    return f"[{seconds // 60}:{seconds % 60:02d}]"
+
+
+def build_context(rows: List[Dict], query_vector: np.ndarray, budget_tokens: int) -> Tuple[str, int]:
+    """
+    Assemble transcript context for a query within a token budget.
+
+    Rows (caption sentences with 'text', 'timestamp_ms' and 'vector') are ranked
+    by cosine similarity to the normalized query vector. The best ones are kept
+    until the next would exceed the budget, then emitted in chronological order
+    with [mm:ss] markers.
+
+    Returns:
+        Tuple[str, int]: The context text and its token count
+    """
+    if not rows:
+        return "", 0
+
+    vectors = np.asarray([row['vector'] for row in rows], dtype=np.float32)
+    similarities = vectors @ query_vector
+
+    selected = []
+    used = 0
+    for index in np.argsort(-similarities):
+        row = rows[index]
+        line = f"{format_timestamp(row['timestamp_ms'])} {row['text']}"
+        tokens = count_tokens(line) + 1  # newline separator
+        if used + tokens > budget_tokens:
+            break
+        selected.append((row['timestamp_ms'], line))
+        used += tokens
+
+    selected.sort()
+    return "\n".join(line for _, line in selected), used
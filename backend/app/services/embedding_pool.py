@@ -0,0 +1,106 @@
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per worker process, loaded once by _init_worker
+_encoder = None
+_batch_size = 64
+
+def _init_worker(model_name: str, backend: str, torch_threads: int, batch_size: int):
+    global _encoder, _batch_size
+    # Must be set before torch is imported in this (spawned) process
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    import torch
+    from .encoder_backends import load_encoder
+
+    torch.set_num_threads(torch_threads)
+    _encoder = load_encoder(model_name, backend)
+    _batch_size = batch_size
+
+def _ping() -> int:
+    return os.getpid()
+
+def _encode_shard(shm_name: str, total: int, dimension: int, offset: int, texts: List[str]) -> int:
+    """Encode one shard straight into the caller's shared output array."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        output = np.ndarray((total, dimension), dtype=np.float32, buffer=shm.buf)
+        output[offset:offset + len(texts)] = _encoder.encode(
+            texts,
+            batch_size=_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        del output
+    finally:
+        shm.close()
+    return len(texts)
+
+class EmbeddingPool:
+    """
+    Process pool encoding texts on several CPU cores.
+
+    Each worker loads the encoder (see load_encoder) once and runs with
+    `torch_threads` intra-op threads. Inputs are split into contiguous shards,
+    one per worker (at least `batch_size` texts each), and every worker writes
+    its normalized float32 embeddings into a shared-memory array, so results
+    are not pickled back.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dimension: int,
+        workers: int,
+        torch_threads: int = 1,
+        batch_size: int = 64,
+        backend: str = "torch"
+    ):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.workers = workers
+        self.batch_size = batch_size
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, backend, torch_threads, batch_size)
+        )
+        logger.info(f"Started embedding pool (workers={workers}, torch_threads={torch_threads})")
+
+    def warm_up(self):
+        """Start every worker so the model is loaded before the first ingestion."""
+        pids = {future.result() for future in [self._pool.submit(_ping) for _ in range(self.workers)]}
+        logger.info(f"Embedding pool ready with {len(pids)} worker processes")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        total = len(texts)
+        if total == 0:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        shard = max(self.batch_size, math.ceil(total / self.workers))
+        shm = shared_memory.SharedMemory(create=True, size=total * self.dimension * 4)
+        try:
+            futures = [
+                self._pool.submit(_encode_shard, shm.name, total, self.dimension, start, texts[start:start + shard])
+                for start in range(0, total, shard)
+            ]
+            for future in futures:
+                future.result()
+            return np.ndarray((total, self.dimension), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Stopped embedding pool")
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx-int8")
+ENCODER_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "encoders")
+
+class OnnxInt8Encoder:
+    """
+    Mean-pooling sentence encoder running a dynamically quantized int8 ONNX
+    export of a sentence-transformers model on ONNX Runtime.
+
+    Mirrors the parts of the SentenceTransformer API that VideoService uses.
+    The export and quantization happen once and are kept under `cache_dir`.
+    Needs the optional `optimum[onnxruntime]` package.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = ENCODER_CACHE_DIR):
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError as e:
+            raise RuntimeError("The onnx-int8 encoder backend requires 'optimum[onnxruntime]'") from e
+        from huggingface_hub import hf_hub_download
+        from transformers import AutoTokenizer
+
+        repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        target = os.path.join(cache_dir, repo.replace("/", "--") + "-int8")
+        if not os.path.exists(os.path.join(target, "model_quantized.onnx")):
+            logger.info(f"Exporting {repo} to int8 ONNX in {target}")
+            model = ORTModelForFeatureExtraction.from_pretrained(repo, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=target,
+                quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(repo).save_pretrained(target)
+            with open(hf_hub_download(repo, "sentence_bert_config.json")) as source:
+                with open(os.path.join(target, "sentence_bert_config.json"), "w") as config:
+                    config.write(source.read())
+
+        with open(os.path.join(target, "sentence_bert_config.json")) as config:
+            self.max_seq_length = json.load(config).get("max_seq_length", 256)
+        self.tokenizer = AutoTokenizer.from_pretrained(target)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(target, file_name="model_quantized.onnx")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.config.hidden_size
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            embeddings = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+            batches.append(embeddings.astype(np.float32))
+        if not batches:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.concatenate(batches)
+
+def load_encoder(model_name: str, backend: str = "torch", cache_dir: str = ENCODER_CACHE_DIR):
+    """
+    Load the caption/query encoder with the given backend.
+
+    "torch" is the full-precision SentenceTransformer, "torch-int8" the same
+    model with its Linear layers dynamically quantized to int8, "onnx-int8" an
+    int8 ONNX Runtime export (see OnnxInt8Encoder).
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+    if backend == "onnx-int8":
+        return OnnxInt8Encoder(model_name, cache_dir)
+
+    from sentence_transformers import SentenceTransformer
+
+    # Quantized kernels are CPU-only, full precision keeps the automatic device choice
+    encoder = SentenceTransformer(model_name, device=None if backend == "torch" else "cpu")
+    if backend == "torch-int8":
+        import torch
+        encoder = torch.quantization.quantize_dynamic(encoder, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return encoder
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+class BlockingExecutors:
+    """
+    Dedicated thread pools for blocking LanceDB, transcript and encoder calls.
+
+    Query work (searches, query embeddings) and ingestion work (transcript
+    fetches, table writes, index builds) get separate pools so a long ingestion
+    can never take every thread a chat request needs.
+    """
+
+    def __init__(self, query_workers: int, ingest_workers: int):
+        self.query_workers = query_workers
+        self.ingest_workers = ingest_workers
+        self._query = ThreadPoolExecutor(max_workers=query_workers, thread_name_prefix="video-query")
+        self._ingest = ThreadPoolExecutor(max_workers=ingest_workers, thread_name_prefix="video-ingest")
+        logger.info(f"Started blocking executors (query={query_workers}, ingest={ingest_workers})")
+
+    async def run_query(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._query, partial(func, *args, **kwargs))
+
+    async def run_ingest(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._ingest, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        self._query.shutdown(wait=False, cancel_futures=True)
+        self._ingest.shutdown(wait=False, cancel_futures=True)
+        logger.info("Stopped blocking executors")
@@ -0,0 +1,66 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+class TableHandleCache:
+    """
+    LRU cache of open LanceDB table handles, keyed by table name.
+
+    Opening a table reads its manifest from disk, so handles are kept between
+    requests. Lookups happen on the query and ingest pools, hence the lock.
+    Any write that replaces or reindexes a table must call invalidate(); writes
+    from other processes are picked up by the connection's
+    read_consistency_interval (VIDEO_READ_CONSISTENCY_SECONDS).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get_or_open(self, name: str, opener: Callable[[str], Any]) -> Any:
+        if not self.enabled:
+            return opener(name)
+
+        with self._lock:
+            table = self._entries.get(name)
+            if table is not None:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = opener(name)
+        with self._lock:
+            self._entries[name] = table
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return table
+
+    def contains(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
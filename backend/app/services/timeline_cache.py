@@ -0,0 +1,130 @@
+import logging
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChunkTimeline:
+    """A video's context chunks ordered by start time, tagged with the content version they came from."""
+    starts: List[float]
+    ends: List[float]
+    texts: List[str]
+    version: Optional[str] = None
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict], version: Optional[str] = None) -> "ChunkTimeline":
+        chunks = sorted(chunks, key=lambda c: c['start_time'])
+        return cls(
+            starts=[c['start_time'] for c in chunks],
+            ends=[c['start_time'] + c['duration'] for c in chunks],
+            texts=[c['text'] for c in chunks],
+            version=version
+        )
+
+    @property
+    def nbytes(self) -> int:
+        # Two floats per chunk plus the text payload
+        return 16 * len(self.starts) + sum(len(text) for text in self.texts)
+
+    def span_at(self, timestamp: float) -> Optional[Tuple[float, float]]:
+        """Start and end time of the previous, current and next chunks around a timestamp."""
+        index = bisect_right(self.starts, timestamp) - 1
+        if index < 0 or timestamp > self.ends[index]:
+            return None
+        neighbours = range(max(0, index - 1), min(len(self.starts), index + 2))
+        return self.starts[neighbours[0]], max(self.ends[i] for i in neighbours)
+
+    def context_at(self, timestamp: float) -> Optional[str]:
+        """Join the chunk containing the timestamp with its previous and next chunks."""
+        index = bisect_right(self.starts, timestamp) - 1
+        if index < 0 or timestamp > self.ends[index]:
+            return None
+        return ' '.join(self.texts[max(0, index - 1):index + 2])
+
+class ChunkTimelineCache:
+    """
+    In-process LRU cache of per-video chunk timelines, bounded by total bytes.
+
+    Timelines only change when a video is reprocessed. Reprocessing in another
+    process is caught by get(), which treats a timeline whose version differs
+    from the video's current content version (read from MongoDB) as a miss.
+    The reprocessing process also calls invalidate(); a loader reads
+    generation() before fetching and passes it to put(), so a timeline fetched
+    before an invalidation is never cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ChunkTimeline]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, video_id: str, version: Optional[str] = None) -> Optional[ChunkTimeline]:
+        timeline = self._entries.get(video_id)
+        if timeline is not None and timeline.version != version:
+            # Reprocessed since it was cached, possibly by another process
+            self._remove(video_id)
+            timeline = None
+        if timeline is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(video_id)
+        self.hits += 1
+        return timeline
+
+    def generation(self, video_id: str) -> int:
+        """Number of times the video's timeline has been invalidated."""
+        return self._generations.get(video_id, 0)
+
+    def put(self, video_id: str, timeline: ChunkTimeline, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation(video_id):
+            logger.info(f"Not caching timeline for {video_id}: invalidated while loading")
+            return
+
+        size = timeline.nbytes
+        if size > self.max_bytes:
+            logger.info(f"Timeline for {video_id} ({size} bytes) exceeds the cache budget")
+            return
+
+        self._remove(video_id)
+        self._entries[video_id] = timeline
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def contains(self, video_id: str) -> bool:
+        """Whether a timeline is cached, without counting a hit or miss."""
+        return video_id in self._entries
+
+    def invalidate(self, video_id: str):
+        self._generations[video_id] = self.generation(video_id) + 1
+        self._remove(video_id)
+
+    def _remove(self, video_id: str):
+        timeline = self._entries.pop(video_id, None)
+        if timeline is not None:
+            self._bytes -= timeline.nbytes
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
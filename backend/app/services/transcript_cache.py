@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from typing import Dict, List, Optional
+from youtube_transcript_api import YouTubeTranscriptApi
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Same location as VideoService.data_dir
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+
+class TranscriptCache:
+    """
+    Content-addressed on-disk cache of raw YouTube caption lists.
+
+    Caption lists are stored gzip-compressed under objects/<sha256 of content>,
+    and refs/<video key> records which object belongs to a video, so identical
+    transcripts are stored once. Objects are evicted least-recently-used first
+    once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._objects_dir = os.path.join(root, "objects")
+        self._refs_dir = os.path.join(root, "refs")
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._refs_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _ref_path(self, video_id: str) -> str:
+        # Hash the id so arbitrary URL fragments are safe file names
+        key = hashlib.sha1(video_id.encode("utf-8")).hexdigest()
+        return os.path.join(self._refs_dir, key)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects_dir, f"{digest}.json.gz")
+
+    def _write_atomic(self, path: str, payload: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, video_id: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._ref_path(video_id), encoding="utf-8") as f:
+                digest = f.read().strip()
+            path = self._object_path(digest)
+            with gzip.open(path, "rb") as f:
+                captions = json.loads(f.read())
+            # Refresh the modification time, it is the LRU clock
+            os.utime(path)
+            return captions
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached transcript for {video_id}: {str(e)}")
+            return None
+
+    def put(self, video_id: str, captions: List[Dict]) -> str:
+        """Store a caption list and point the video at it. Returns the content digest."""
+        payload = json.dumps(captions, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            self._write_atomic(path, gzip.compress(payload))
+        self._write_atomic(self._ref_path(video_id), digest.encode("utf-8"))
+
+        self.evict()
+        return digest
+
+    def invalidate(self, video_id: str):
+        try:
+            os.remove(self._ref_path(video_id))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Delete least recently used objects until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self._objects_dir):
+            if not entry.name.endswith(".json.gz"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        # Refs to evicted objects are left behind and read as misses
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+@lru_cache()
+def get_transcript_cache() -> TranscriptCache:
+    return TranscriptCache(os.path.join(DATA_DIR, "transcripts"), settings.VIDEO_TRANSCRIPT_CACHE_BYTES)
+
+def fetch_transcript(
+    video_id: str,
+    cache: Optional[TranscriptCache] = None,
+    refresh: bool = False
+) -> List[Dict]:
+    """
+    Return the raw caption list of a video, from the cache when possible.
+
+    Args:
+        video_id: YouTube video ID
+        cache: Cache to use, defaults to the shared on-disk cache
+        refresh: Skip the cache lookup and fetch from YouTube again
+
+    Returns:
+        List[Dict]: Captions with 'text', 'start' and 'duration' keys
+    """
+    cache = cache or get_transcript_cache()
+    if cache.enabled and not refresh:
+        captions = cache.get(video_id)
+        if captions is not None:
+            logger.info(f"Using cached transcript for {video_id}")
+            return captions
+
+    captions = YouTubeTranscriptApi.get_transcript(video_id)
+    if cache.enabled and captions:
+        cache.put(video_id, captions)
+    return captions
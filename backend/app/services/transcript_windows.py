@@ -0,0 +1,64 @@
+import numpy as np
+from typing import Dict, List
+
+
+def compute_windows(
+    captions: List[Dict],
+    window_seconds: float = 300.0,
+    overlap_seconds: float = 0.0
+) -> List[Dict]:
+    """
+    Group captions into fixed-length time windows.
+
+    Windows start every `window_seconds - overlap_seconds` seconds from the first
+    caption, and a caption belongs to every window its start time falls in.
+    Boundaries are found with a vectorized searchsorted over the caption start
+    times and each window's text is joined once.
+
+    Args:
+        captions: Caption dicts with 'text', 'start' and 'duration' keys
+        window_seconds: Length of each window in seconds
+        overlap_seconds: Overlap between consecutive windows in seconds
+
+    Returns:
+        List[Dict]: Windows with 'text', 'start' and 'duration' keys
+    """
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be positive")
+    if not 0 <= overlap_seconds < window_seconds:
+        raise ValueError("overlap_seconds must be in [0, window_seconds)")
+    if not captions:
+        return []
+
+    starts = np.fromiter((c['start'] for c in captions), dtype=np.float64, count=len(captions))
+    durations = np.fromiter((c['duration'] for c in captions), dtype=np.float64, count=len(captions))
+    texts = [c['text'] for c in captions]
+
+    if np.any(np.diff(starts) < 0):
+        order = np.argsort(starts, kind='stable')
+        starts, durations = starts[order], durations[order]
+        texts = [texts[i] for i in order]
+
+    # Running max of caption end times, so a window ends when its longest caption does
+    ends = np.maximum.accumulate(starts + durations)
+
+    step = window_seconds - overlap_seconds
+    num_windows = int((starts[-1] - starts[0]) // step) + 1
+    window_starts = starts[0] + step * np.arange(num_windows)
+    lows = np.searchsorted(starts, window_starts, side='left')
+    highs = np.searchsorted(starts, window_starts + window_seconds, side='left')
+
+    # Skip empty windows and trailing windows that add no captions to the previous one
+    keep = highs > np.maximum.accumulate(np.concatenate(([0], highs[:-1])))
+    lows, highs = lows[keep], highs[keep]
+
+    chunk_starts = starts[lows]
+    chunk_durations = ends[highs - 1] - chunk_starts
+    return [
+        {
+            'text': ' '.join(texts[lo:hi]),
+            'start': float(start),
+            'duration': float(duration)
+        }
+        for lo, hi, start, duration in zip(lows.tolist(), highs.tolist(), chunk_starts, chunk_durations)
+    ]
@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
+from ..core.config import get_settings
+from .video_service import VideoService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ACTIVE_JOB_STATUSES = ['queued', 'running']
+FINISHED_JOB_STATUSES = ['completed', 'failed']
+BULK_POLL_SECONDS = 1.0
+
+class VideoJobQueue:
+    """
+    Runs video ingestion in the background with a bounded pool of workers.
+
+    Jobs are persisted in the `video_jobs` collection so their status can be
+    polled and so queued or interrupted jobs are picked up again after a restart.
+
+    Several processes may share the collection. A job is leased to the queue
+    that accepted or claimed it (`owner`): queued jobs by a periodic renewal of
+    all the queue's pending jobs, running jobs by a per-job heartbeat. Only jobs
+    whose lease has expired, queued or running, are reclaimed by another queue. At most one job per
+    video is active, enforced by a partial unique index on `video_id`.
+    """
+
+    def __init__(self, video_service: VideoService, workers: Optional[int] = None):
+        self._service = video_service
+        self._num_workers = workers or settings.VIDEO_JOB_WORKERS
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._reaper: Optional[asyncio.Task] = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lease = timedelta(seconds=settings.VIDEO_JOB_LEASE_SECONDS)
+
+    async def _collection(self) -> AsyncIOMotorCollection:
+        db = await self._service.mongodb
+        return db['video_jobs']
+
+    async def start(self):
+        """Start the workers and re-enqueue jobs left over from a previous run."""
+        if self._workers:
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self._num_workers)
+        ]
+        logger.info(f"Started {self._num_workers} video ingestion workers")
+
+        try:
+            collection = await self._collection()
+            await collection.create_index('job_id', unique=True)
+            await collection.create_index([('video_id', 1), ('status', 1)])
+            # Jobs created before the `active` flag existed
+            await collection.update_many(
+                {'status': {'$in': ACTIVE_JOB_STATUSES}, 'active': {'$exists': False}},
+                {'$set': {'active': True}}
+            )
+            await collection.create_index(
+                'video_id',
+                unique=True,
+                partialFilterExpression={'active': True},
+                name='video_id_active_unique'
+            )
+
+            # Jobs whose queue stopped renewing their lease are retried from the start
+            reclaimed = await self._reclaim_stale_jobs()
+            if reclaimed:
+                logger.info(f"Re-enqueued {reclaimed} abandoned video jobs")
+        except Exception as e:
+            logger.error(f"Error recovering pending video jobs: {str(e)}", exc_info=True)
+
+        self._reaper = asyncio.create_task(self._reap())
+
+    async def stop(self):
+        tasks = self._workers + ([self._reaper] if self._reaper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+        logger.info("Stopped video ingestion workers")
+
+    async def _reclaim_stale_jobs(self) -> int:
+        """
+        Take over queued or running jobs whose lease expired and queue them here.
+        Returns how many were reclaimed.
+        """
+        collection = await self._collection()
+        reclaimed = 0
+        while True:
+            now = datetime.utcnow()
+            job = await collection.find_one_and_update(
+                {
+                    'status': {'$in': ACTIVE_JOB_STATUSES},
+                    '$or': [
+                        {'lease_expires_at': {'$lt': now}},
+                        {'lease_expires_at': {'$exists': False}}
+                    ]
+                },
+                {'$set': {
+                    'status': 'queued',
+                    'stage': None,
+                    'owner': self._owner,
+                    'lease_expires_at': now + self._lease,
+                    'updated_at': now
+                }},
+                sort=[('created_at', 1)]
+            )
+            if job is None:
+                return reclaimed
+            logger.warning(f"Reclaimed job {job['job_id']} from {job.get('owner')}, its lease expired")
+            self._queue.put_nowait(job['job_id'])
+            reclaimed += 1
+
+    async def _reap(self):
+        """Renew the leases of this queue's pending jobs and pick up jobs abandoned by other queues."""
+        collection = await self._collection()
+        while True:
+            await asyncio.sleep(self._lease.total_seconds() / 3)
+            try:
+                await collection.update_many(
+                    {'owner': self._owner, 'status': 'queued'},
+                    {'$set': {'lease_expires_at': datetime.utcnow() + self._lease}}
+                )
+                await self._reclaim_stale_jobs()
+            except Exception as e:
+                logger.error(f"Error reclaiming stale video jobs: {str(e)}")
+
+    async def _heartbeat(self, job_id: str):
+        collection = await self._collection()
+        while True:
+            await asyncio.sleep(self._lease.total_seconds() / 3)
+            await collection.update_one(
+                {'job_id': job_id, 'owner': self._owner, 'status': 'running'},
+                {'$set': {'lease_expires_at': datetime.utcnow() + self._lease}}
+            )
+
+    async def enqueue(self, video_id: str, url: str, refresh_transcript: bool = False) -> Dict:
+        """Create a job for a video, or return the job already queued or running for it."""
+        collection = await self._collection()
+
+        existing = await collection.find_one(
+            {'video_id': video_id, 'status': {'$in': ACTIVE_JOB_STATUSES}}
+        )
+        if existing:
+            return self._convert_job(existing)
+
+        now = datetime.utcnow()
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'video_id': video_id,
+            'url': url,
+            'refresh_transcript': refresh_transcript,
+            'status': 'queued',
+            'active': True,
+            'owner': self._owner,
+            'lease_expires_at': now + self._lease,
+            'stage': None,
+            'stages': [],
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        try:
+            await collection.insert_one(job)
+        except DuplicateKeyError:
+            # A concurrent request created the active job for this video first
+            existing = await collection.find_one({'video_id': video_id, 'active': True})
+            if existing:
+                return self._convert_job(existing)
+            raise
+        await self._service.set_video_status(video_id, 'queued', url=url)
+
+        self._queue.put_nowait(job['job_id'])
+        logger.info(f"Enqueued job {job['job_id']} for video {video_id}")
+        return self._convert_job(job)
+
+    async def process_bulk(
+        self,
+        urls: List[str],
+        force: bool = False,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Ingest many videos through the job queue, yielding one result per URL.
+
+        Invalid, duplicate and already processed videos are reported first, the
+        rest are yielded in completion order. At most `concurrency` jobs of the
+        request are outstanding at a time; a video that already has an active job
+        (e.g. from /process) is waited on rather than ingested again. Jobs keep
+        running if the caller stops consuming the results.
+        """
+        concurrency = min(
+            concurrency or settings.VIDEO_BULK_CONCURRENCY,
+            settings.VIDEO_BULK_MAX_CONCURRENCY
+        )
+
+        # Dedupe by video id, keeping the first URL seen for each video
+        pending: Dict[str, str] = {}
+        for url in urls:
+            url = url.strip()
+            if not url:
+                continue
+            try:
+                video_id = self._service.extract_video_id(url)
+            except ValueError as e:
+                yield {'url': url, 'videoId': None, 'status': 'invalid', 'error': str(e)}
+                continue
+            if video_id in pending:
+                yield {'url': url, 'videoId': video_id, 'status': 'duplicate', 'error': None}
+                continue
+            pending[video_id] = url
+
+        if pending and not force:
+            db = await self._service.mongodb
+            processed = await db['videos'].find(
+                {'video_id': {'$in': list(pending)}, 'status': 'processed'},
+                {'video_id': 1}
+            ).to_list(length=None)
+            for doc in processed:
+                url = pending.pop(doc['video_id'])
+                yield {'url': url, 'videoId': doc['video_id'], 'status': 'skipped', 'error': None}
+
+        collection = await self._collection()
+        waiting = list(pending.items())
+        outstanding: Dict[str, Dict] = {}
+        while waiting or outstanding:
+            while waiting and len(outstanding) < concurrency:
+                video_id, url = waiting.pop(0)
+                result = {'url': url, 'videoId': video_id, 'started': time.perf_counter()}
+                try:
+                    job = await self.enqueue(video_id, url)
+                except Exception as e:
+                    yield {'url': url, 'videoId': video_id, 'status': 'failed', 'error': str(e)}
+                    continue
+                outstanding[job['job_id']] = result
+
+            await asyncio.sleep(BULK_POLL_SECONDS)
+            finished = await collection.find(
+                {'job_id': {'$in': list(outstanding)}, 'status': {'$in': FINISHED_JOB_STATUSES}},
+                {'job_id': 1, 'status': 1, 'error': 1, 'result': 1}
+            ).to_list(length=None)
+            for job in finished:
+                result = outstanding.pop(job['job_id'])
+                completed = job['status'] == 'completed'
+                yield {
+                    'url': result['url'],
+                    'videoId': result['videoId'],
+                    'jobId': job['job_id'],
+                    'status': 'processed' if completed else 'failed',
+                    'error': job.get('error'),
+                    'path': (job.get('result') or {}).get('path') if completed else None,
+                    'elapsed_ms': round((time.perf_counter() - result['started']) * 1000, 2)
+                }
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        collection = await self._collection()
+        job = await collection.find_one({'job_id': job_id})
+        return self._convert_job(job)
+
+    def _convert_job(self, job: Optional[Dict]) -> Optional[Dict]:
+        if job is None:
+            return None
+        job.pop('_id', None)
+        return job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed on job {job_id}: {str(e)}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        collection = await self._collection()
+
+        # Claim the job atomically so it is never run twice; another queue may
+        # have reclaimed it since it was put on this one
+        now = datetime.utcnow()
+        job = await collection.find_one_and_update(
+            {'job_id': job_id, 'status': 'queued', 'owner': self._owner},
+            {'$set': {
+                'status': 'running',
+                'owner': self._owner,
+                'lease_expires_at': now + self._lease,
+                'updated_at': now
+            }}
+        )
+        if job is None:
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await self._run_claimed_job(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _run_claimed_job(self, job: Dict):
+        collection = await self._collection()
+        job_id = job['job_id']
+        owned = {'job_id': job_id, 'owner': self._owner}
+        video_id = job['video_id']
+        await self._service.set_video_status(video_id, 'running')
+
+        async def progress(stage: str):
+            now = datetime.utcnow()
+            await collection.update_one(
+                owned,
+                {
+                    '$set': {'stage': stage, 'updated_at': now},
+                    '$push': {'stages': {'name': stage, 'started_at': now}}
+                }
+            )
+
+        try:
+            result = await self._service.process_video(
+                video_id,
+                job['url'],
+                progress=progress,
+                refresh_transcript=job.get('refresh_transcript', False)
+            )
+            if not result:
+                raise ValueError("No captions found for the video")
+        except Exception as e:
+            logger.error(f"Job {job_id} for video {video_id} failed: {str(e)}")
+            await collection.update_one(
+                owned,
+                {'$set': {'status': 'failed', 'active': False, 'error': str(e), 'updated_at': datetime.utcnow()}}
+            )
+            await self._service.set_video_status(video_id, 'failed', error=str(e))
+            return
+
+        await collection.update_one(
+            owned,
+            {'$set': {
+                'status': 'completed',
+                'active': False,
+                'stage': None,
+                'result': result,
+                'updated_at': datetime.utcnow()
+            }}
+        )
+        logger.info(f"Job {job_id} for video {video_id} completed ({result['path']})")
@@ -1,19 +1,41 @@
 import logging
-from typing import Optional, Tuple, List, Dict
-from youtube_transcript_api import YouTubeTranscriptApi
+import asyncio
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional, Tuple, List, Dict, Set, Callable, Awaitable, AsyncIterator, Iterator
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import lancedb
 import re
 import os
 from ..core.config import get_settings
-import openai
+from openai import AsyncOpenAI
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import pyarrow as pa
 from ..core.database import mongodb
+from .transcript_windows import compute_windows
+from .timeline_cache import ChunkTimeline, ChunkTimelineCache
+from .answer_cache import SemanticAnswerCache
+from .table_cache import TableHandleCache
+from .executors import BlockingExecutors
+from .embedding_pool import EmbeddingPool
+from .encoder_backends import load_encoder
+from .transcript_cache import get_transcript_cache, fetch_transcript
+from .caption_fingerprint import fingerprint_captions, chunk_hash, diff_caption_hashes
+from .caption_normalizer import normalize_captions
+from .context_builder import build_context
+from .video_summarizer import VideoSummarizer, format_overview, is_overview_question
 import logging
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime
+from pymongo import ReplaceOne, DeleteMany
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
+import base64
+import json
 import aiohttp
 
 # Configure logging
@@ -21,7 +43,79 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
-openai.api_key = settings.OPENAI_API_KEY
+
+RETRIEVAL_MODES = ("fts", "vector", "hybrid")
+OPENAI_CHAT_MODEL = "gpt-3.5-turbo"
+CAPTION_RESULT_COLUMNS = ["text", "timestamp_ms", "duration_ms"]
+LIBRARY_SNIPPET_CHARS = 200
+# Ingestion bookkeeping that API responses do not need
+VIDEO_DOC_PROJECTION = {'caption_hashes': 0, 'chapters': 0}
+# Fields of a paginated video listing: the compact default and what can be asked for
+VIDEO_LIST_FIELDS = ['video_id', 'title', 'url', 'status', 'created_at']
+VIDEO_LIST_OPTIONAL_FIELDS = ['error', 'summary', 'updated_at', 'summarized_at']
+
+@dataclass
+class RetrievalOptions:
+    """Per-request knobs for locating the anchor caption of a question."""
+    mode: Optional[str] = None
+    top_k: int = 1
+    nprobes: Optional[int] = None
+    refine_factor: Optional[int] = None
+    rrf_k: Optional[int] = None
+    fts_weight: float = 1.0
+    vector_weight: float = 1.0
+
+    def __post_init__(self):
+        if self.mode is None:
+            self.mode = settings.VIDEO_RETRIEVAL_MODE
+        if self.mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {self.mode}")
+        if self.nprobes is None:
+            self.nprobes = settings.VIDEO_ANN_NPROBES
+        if self.refine_factor is None:
+            self.refine_factor = settings.VIDEO_ANN_REFINE_FACTOR
+        if self.rrf_k is None:
+            self.rrf_k = settings.VIDEO_RRF_K
+        if self.top_k < 1 or self.rrf_k < 1:
+            raise ValueError("top_k and rrf_k must be positive")
+
+@dataclass
+class PreparedAnswer:
+    """
+    Outcome of retrieval for a question: either a final `answer` (cache hit or
+    nothing found) or the chat `messages` to send to the LLM.
+    """
+    timestamp: Optional[float]
+    answer: Optional[str] = None
+    messages: Optional[List[Dict]] = None
+    query_embedding: Optional[np.ndarray] = None
+    content_version: Optional[str] = None
+
+def reciprocal_rank_fusion(ranked_lists: List[Tuple[List[Dict], float]], k: int) -> List[Dict]:
+    """
+    Fuse ranked caption lists with weighted reciprocal-rank fusion.
+
+    Each caption scores sum(weight / (k + rank)) over the lists it appears in,
+    captions are identified by their video (when selected), timestamp and text.
+    """
+    scores: Dict[Tuple, float] = {}
+    rows: Dict[Tuple, Dict] = {}
+    for results, weight in ranked_lists:
+        for rank, row in enumerate(results, start=1):
+            key = (row.get('video_id'), row['timestamp_ms'], row['text'])
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            rows.setdefault(key, row)
+
+    fused = sorted(scores, key=scores.get, reverse=True)
+    return [{**rows[key], '_rrf_score': scores[key]} for key in fused]
+
+def relevance(row: Dict) -> float:
+    """Higher-is-better score of a search hit, whichever search produced it."""
+    if '_rrf_score' in row:
+        return row['_rrf_score']
+    if '_distance' in row:
+        return -row['_distance']
+    return row.get('_score', row.get('score', 0.0))
 
 class VideoService:
     def __init__(self):
@@ -33,11 +127,28 @@ class VideoService:
             
             logger.info(f"Initialized directory: {self.data_dir}")
             
-            # Initialize LanceDB for vector storage
-            self.db = lancedb.connect(self.data_dir)
+            # Initialize LanceDB for vector storage. Cached table handles check for
+            # newer versions written by other processes (or scripts) before reading
+            consistency = settings.VIDEO_READ_CONSISTENCY_SECONDS
+            self.db = lancedb.connect(
+                self.data_dir,
+                read_consistency_interval=timedelta(seconds=consistency) if consistency >= 0 else None
+            )
             
             # Initialize sentence transformer for embeddings
-            self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+            self.encoder = load_encoder(settings.VIDEO_ENCODER_MODEL, settings.VIDEO_ENCODER_BACKEND)
+            
+            # Ingestion embeddings spread over worker processes when configured
+            self.embedding_pool = None
+            if settings.VIDEO_EMBEDDING_WORKERS > 0:
+                self.embedding_pool = EmbeddingPool(
+                    settings.VIDEO_ENCODER_MODEL,
+                    backend=settings.VIDEO_ENCODER_BACKEND,
+                    dimension=self.encoder.get_sentence_embedding_dimension(),
+                    workers=settings.VIDEO_EMBEDDING_WORKERS,
+                    torch_threads=settings.VIDEO_EMBEDDING_TORCH_THREADS,
+                    batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE
+                )
             
             # Text splitter for segmenting transcripts
             self.text_splitter = RecursiveCharacterTextSplitter(
@@ -46,15 +157,296 @@ class VideoService:
                 separators=["\n", ".", "!", "?", ",", " ", ""]
             )
             
+            # Index builds on the shared table are serialized, concurrent ones conflict on commit
+            self._index_lock = threading.Lock()
+            self._ann_trained_rows: Dict[str, int] = {}
+            
+            # Thread pools for blocking LanceDB, transcript and encoder calls
+            self.executors = BlockingExecutors(
+                query_workers=settings.VIDEO_QUERY_THREADS,
+                ingest_workers=settings.VIDEO_INGEST_THREADS
+            )
+            
+            # Async client so completions never block the event loop
+            self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            
             # Initialize MongoDB connection
             self._db: Optional[AsyncIOMotorDatabase] = None
             
+            # Raw captions on disk, shared with utils.video_utils
+            self.transcript_cache = get_transcript_cache()
+            
+            # Per-video chunk timelines, so context lookups skip MongoDB
+            self.timeline_cache = ChunkTimelineCache(settings.VIDEO_TIMELINE_CACHE_BYTES)
+            
+            # Open LanceDB table handles, and the warm-ups scheduled when a video is opened
+            self.table_cache = TableHandleCache(settings.VIDEO_TABLE_CACHE_ENTRIES)
+            self._prefetches: Dict[str, asyncio.Task] = {}
+            
+            # Per-video library searches share the query pool with chat, cap their share of it
+            library_concurrency = settings.VIDEO_LIBRARY_SEARCH_CONCURRENCY or settings.VIDEO_QUERY_THREADS // 2
+            self._library_search_slots = asyncio.Semaphore(max(1, library_concurrency))
+            # Searches still finishing after their library request timed out
+            self._library_stragglers: Set[asyncio.Task] = set()
+            
+            # Answers to semantically equivalent questions, so repeats skip OpenAI
+            self.answer_cache = SemanticAnswerCache(
+                threshold=settings.VIDEO_ANSWER_CACHE_THRESHOLD,
+                ttl_seconds=settings.VIDEO_ANSWER_CACHE_TTL_SECONDS,
+                max_entries=settings.VIDEO_ANSWER_CACHE_MAX_ENTRIES
+            )
+            
+            # Map-reduce summaries and chapters, generated at ingestion when enabled
+            self.summarizer = VideoSummarizer(
+                self.openai_client,
+                model=OPENAI_CHAT_MODEL,
+                concurrency=settings.VIDEO_SUMMARY_CONCURRENCY
+            )
+            
             logger.info("VideoService initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing VideoService: {str(e)}")
             raise
 
+    def warm_up(self):
+        """Run a dummy encode and touch LanceDB so the first request is not cold."""
+        logger.info("Warming up VideoService")
+        self.encoder.encode(["warm up"], convert_to_numpy=True)
+        if self.embedding_pool is not None:
+            self.embedding_pool.warm_up()
+        self.db.table_names()
+        logger.info("VideoService warm-up complete")
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches into normalized float32 vectors."""
+        if self.embedding_pool is not None and len(texts) >= settings.VIDEO_EMBEDDING_POOL_MIN_TEXTS:
+            return self.embedding_pool.encode(texts)
+        embeddings = self.encoder.encode(
+            texts,
+            batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype(np.float32, copy=False)
+
+    @lru_cache(maxsize=256)
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a single query, memoized so cache lookups and vector search share it."""
+        return self._embed_texts([query])[0]
+
+    def _maybe_create_ann_index(self, table):
+        """Build an IVF-PQ index once the table is large enough to benefit from one."""
+        num_rows = table.count_rows()
+        if num_rows < settings.VIDEO_ANN_INDEX_MIN_ROWS:
+            logger.info(f"Skipping ANN index, {num_rows} rows is below the threshold")
+            return
+
+        dimension = self.encoder.get_sentence_embedding_dimension()
+        # sqrt(n) partitions and 8-dimensional sub-vectors are the usual IVF-PQ defaults
+        num_partitions = max(1, int(math.sqrt(num_rows)))
+        num_sub_vectors = dimension // 8 if dimension % 8 == 0 else 1
+        try:
+            logger.info(f"Creating IVF-PQ index ({num_partitions} partitions) over {num_rows} rows")
+            table.create_index(
+                metric="cosine",
+                num_partitions=num_partitions,
+                num_sub_vectors=num_sub_vectors,
+                vector_column_name="vector",
+                replace=True
+            )
+        except Exception as e:
+            logger.warning(f"Warning while creating ANN index: {str(e)}")
+
+    def _caption_filter(self, video_id: str) -> Optional[str]:
+        """SQL predicate selecting a video's rows, needed only for the shared table."""
+        if settings.VIDEO_STORAGE_MODE != "shared":
+            return None
+        escaped = video_id.replace("'", "''")
+        return f"video_id = '{escaped}'"
+
+    def _caption_table_name(self, video_id: str) -> str:
+        if settings.VIDEO_STORAGE_MODE == "shared":
+            return settings.VIDEO_SHARED_TABLE_NAME
+        return f"video_{video_id}"
+
+    def _open_caption_table(self, video_id: str):
+        """Open the LanceDB table holding a video's captions, reusing a cached handle."""
+        return self.table_cache.get_or_open(self._caption_table_name(video_id), self.db.open_table)
+
+    def _write_caption_batches(self, video_id: str, batches: Iterator[pa.RecordBatch]):
+        """
+        Replace a video's caption rows, streaming them batch by batch.
+
+        Only one batch is held at a time, so memory does not grow with the
+        transcript, and the rows land in a single write. Returns the table
+        holding the rows and the row count.
+        """
+        table_name = self._caption_table_name(video_id)
+
+        if settings.VIDEO_STORAGE_MODE == "shared":
+            if table_name in self.db.table_names():
+                table = self.db.open_table(table_name)
+                table.delete(self._caption_filter(video_id))
+            else:
+                table = self._create_shared_table(table_name)
+            return table, self._append_batches(table, batches)
+
+        # Drop existing table if it exists
+        try:
+            if table_name in self.db.table_names():
+                self.db.drop_table(table_name)
+        except Exception as e:
+            logger.warning(f"Error dropping existing table: {str(e)}")
+
+        logger.info(f"Creating table for {table_name}")
+        rows, reader = self._batch_reader(batches)
+        table = self.db.create_table(table_name, data=reader, schema=self._caption_schema(), mode="create")
+        return table, rows[0]
+
+    def _create_shared_table(self, table_name: str):
+        """Create the empty shared captions table, or open it if another worker just did."""
+        logger.info(f"Creating shared captions table {table_name}")
+        try:
+            return self.db.create_table(table_name, schema=self._caption_schema(), mode="create")
+        except Exception:
+            if table_name not in self.db.table_names():
+                raise
+            logger.info(f"Shared captions table {table_name} was created concurrently, opening it")
+            return self.db.open_table(table_name)
+
+    def _batch_reader(self, batches: Iterator[pa.RecordBatch]) -> Tuple[List[int], pa.RecordBatchReader]:
+        """Wrap caption batches in one stream; the list holds the row count once it is consumed."""
+        rows = [0]
+
+        def counted() -> Iterator[pa.RecordBatch]:
+            for batch in batches:
+                rows[0] += batch.num_rows
+                yield batch
+
+        return rows, pa.RecordBatchReader.from_batches(self._caption_schema(), counted())
+
+    def _append_batches(self, table, batches: Iterator[pa.RecordBatch]) -> int:
+        """
+        Append caption batches with a single add().
+
+        One add per batch left a fragment and a table version per batch; a
+        single streamed write commits one version with as few fragments as
+        possible.
+        """
+        rows, reader = self._batch_reader(batches)
+        table.add(reader)
+        return rows[0]
+
+    def _search_fts(
+        self,
+        table,
+        query: str,
+        limit: int,
+        where: Optional[str] = None,
+        columns: List[str] = CAPTION_RESULT_COLUMNS
+    ) -> List[Dict]:
+        search = table.search(query)
+        if where:
+            search = search.where(where, prefilter=True)
+        return (
+            search
+            .limit(limit)
+            .select(columns)
+            .to_list()
+        )
+
+    def _search_vector(
+        self,
+        table,
+        query: str,
+        options: RetrievalOptions,
+        limit: int,
+        where: Optional[str] = None,
+        columns: List[str] = CAPTION_RESULT_COLUMNS
+    ) -> List[Dict]:
+        query_vector = self._embed_query(query)
+        search = (
+            table.search(query_vector, vector_column_name="vector")
+            .metric("cosine")
+            .nprobes(options.nprobes)
+        )
+        if options.refine_factor:
+            search = search.refine_factor(options.refine_factor)
+        if where:
+            search = search.where(where, prefilter=True)
+        return (
+            search
+            .limit(limit)
+            .select(columns)
+            .to_list()
+        )
+
+    def _table_columns(self, table) -> List[str]:
+        """
+        Column names of a table. Blocking: with a read consistency interval the
+        handle may check storage for a newer version first.
+        """
+        return table.schema.names
+
+    async def _run_timed(self, timings: Dict[str, float], key: str, func, *args):
+        """Run a blocking search on the query pool and record its wall time in ms."""
+        started = time.perf_counter()
+        result = await self.executors.run_query(func, *args)
+        timings[key] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def _retrieve(
+        self,
+        table,
+        query: str,
+        options: RetrievalOptions,
+        timings: Optional[Dict[str, float]] = None,
+        where: Optional[str] = None,
+        columns: List[str] = CAPTION_RESULT_COLUMNS,
+        table_columns: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Return the best matching captions for a query, best first."""
+        timings = timings if timings is not None else {}
+        if table_columns is None:
+            table_columns = await self.executors.run_query(self._table_columns, table)
+        mode = options.mode
+        if mode != "fts" and "vector" not in table_columns:
+            logger.warning("Table has no vector column, falling back to full-text search")
+            mode = "fts"
+
+        if mode == "fts":
+            return await self._run_timed(
+                timings, "fts_ms", self._search_fts, table, query, options.top_k, where, columns
+            )
+        if mode == "vector":
+            return await self._run_timed(
+                timings, "vector_ms", self._search_vector, table, query, options, options.top_k, where, columns
+            )
+
+        # Hybrid: run both searches concurrently over a wider candidate pool, then fuse
+        candidates = max(options.top_k, settings.VIDEO_HYBRID_CANDIDATES)
+        fts_results, vector_results = await asyncio.gather(
+            self._run_timed(timings, "fts_ms", self._search_fts, table, query, candidates, where, columns),
+            self._run_timed(
+                timings, "vector_ms", self._search_vector, table, query, options, candidates, where, columns
+            )
+        )
+        started = time.perf_counter()
+        fused = reciprocal_rank_fusion(
+            [(fts_results, options.fts_weight), (vector_results, options.vector_weight)],
+            options.rrf_k
+        )
+        timings["fusion_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return fused[:options.top_k]
+
+    def close(self):
+        """Release the blocking executors and the embedding pool."""
+        self.executors.shutdown()
+        if self.embedding_pool is not None:
+            self.embedding_pool.shutdown()
+
     @property
     async def mongodb(self) -> AsyncIOMotorDatabase:
         """Get MongoDB database instance."""
@@ -77,32 +469,12 @@ class VideoService:
         raise ValueError("Invalid YouTube URL")
 
     def _create_five_minute_chunks(self, captions: List[Dict]) -> List[Dict]:
-        """Create 5-minute chunks from captions for broader context."""
-        chunks = []
-        current_chunk = {
-            'text': '',
-            'start': 0,
-            'duration': 0
-        }
-        
-        for caption in captions:
-            if current_chunk['duration'] >= 300:  # 5 minutes = 300 seconds
-                chunks.append(current_chunk)
-                current_chunk = {
-                    'text': caption['text'] + ' ',
-                    'start': caption['start'],
-                    'duration': caption['duration']
-                }
-            else:
-                current_chunk['text'] += caption['text'] + ' '
-                if not current_chunk['text']:
-                    current_chunk['start'] = caption['start']
-                current_chunk['duration'] += caption['duration']
-        
-        if current_chunk['text']:
-            chunks.append(current_chunk)
-        
-        return chunks
+        """Create 5-minute chunks (VIDEO_CHUNK_WINDOW_SECONDS) from captions for broader context."""
+        return compute_windows(
+            captions,
+            window_seconds=settings.VIDEO_CHUNK_WINDOW_SECONDS,
+            overlap_seconds=settings.VIDEO_CHUNK_OVERLAP_SECONDS
+        )
 
     async def _store_chunks_in_mongodb(self, video_id: str, chunks: List[Dict]):
         """Store 5-minute chunks in MongoDB."""
@@ -110,74 +482,231 @@ class VideoService:
             db = await self.mongodb
             collection = db['video_chunks']
             
-            # Create documents for bulk insert
-            documents = []
-            for i, chunk in enumerate(chunks):
-                documents.append({
-                    'video_id': video_id,
-                    'chunk_index': i,
-                    'text': chunk['text'],
-                    'start_time': chunk['start'],
-                    'duration': chunk['duration']
-                })
-            
             # Delete existing chunks for this video
             await collection.delete_many({'video_id': video_id})
             
-            # Insert new chunks
-            if documents:
-                await collection.insert_many(documents)
-                logger.info(f"Stored {len(documents)} chunks for video {video_id}")
+            # Insert new chunks, VIDEO_CHUNK_WRITE_BATCH documents at a time
+            size = settings.VIDEO_CHUNK_WRITE_BATCH
+            for start in range(0, len(chunks), size):
+                documents = [
+                    {
+                        'video_id': video_id,
+                        'chunk_index': i,
+                        'text': chunk['text'],
+                        'start_time': chunk['start'],
+                        'duration': chunk['duration'],
+                        'hash': chunk_hash(chunk)
+                    }
+                    for i, chunk in enumerate(chunks[start:start + size], start=start)
+                ]
+                await collection.insert_many(documents, ordered=False)
+            if chunks:
+                logger.info(f"Stored {len(chunks)} chunks for video {video_id}")
+            
+            self.timeline_cache.invalidate(video_id)
             
         except Exception as e:
             logger.error(f"Error storing chunks in MongoDB: {str(e)}")
             raise
 
+    async def ensure_indexes(self):
+        """Create the MongoDB indexes used by chunk and context lookups and video listing."""
+        try:
+            db = await self.mongodb
+            chunks = db['video_chunks']
+            await chunks.create_index([('video_id', 1), ('start_time', 1)])
+            await chunks.create_index([('video_id', 1), ('chunk_index', 1)])
+            # Keyset pagination of the video list, newest first
+            await db['videos'].create_index([('created_at', -1), ('_id', -1)])
+            logger.info("Ensured video_chunks and videos indexes")
+        except Exception as e:
+            logger.error(f"Error creating MongoDB indexes: {str(e)}")
+            raise
+
+    def _context_pipeline(self, video_id: str, timestamp: float) -> List[Dict]:
+        """
+        Aggregation returning the chunk at a timestamp plus its neighbours in order.
+
+        Both branches are served by the (video_id, start_time) index: the latest two
+        chunks starting at or before the timestamp, and the first one after it.
+        """
+        return [
+            {'$match': {'video_id': video_id, 'start_time': {'$lte': timestamp}}},
+            {'$sort': {'start_time': -1}},
+            {'$limit': 2},
+            {'$unionWith': {
+                'coll': 'video_chunks',
+                'pipeline': [
+                    {'$match': {'video_id': video_id, 'start_time': {'$gt': timestamp}}},
+                    {'$sort': {'start_time': 1}},
+                    {'$limit': 1}
+                ]
+            }},
+            {'$sort': {'start_time': 1}},
+            {'$project': {'_id': 0, 'text': 1, 'start_time': 1, 'duration': 1}}
+        ]
+
+    async def _update_chunks_in_mongodb(self, video_id: str, chunks: List[Dict]) -> int:
+        """Upsert only the chunks whose content changed and drop trailing ones. Returns the write count."""
+        try:
+            db = await self.mongodb
+            collection = db['video_chunks']
+            
+            existing = await collection.find(
+                {'video_id': video_id},
+                {'_id': 0, 'chunk_index': 1, 'hash': 1}
+            ).to_list(length=None)
+            existing_hashes = {doc['chunk_index']: doc.get('hash') for doc in existing}
+            
+            operations = []
+            for i, chunk in enumerate(chunks):
+                digest = chunk_hash(chunk)
+                if existing_hashes.get(i) == digest:
+                    continue
+                operations.append(ReplaceOne(
+                    {'video_id': video_id, 'chunk_index': i},
+                    {
+                        'video_id': video_id,
+                        'chunk_index': i,
+                        'text': chunk['text'],
+                        'start_time': chunk['start'],
+                        'duration': chunk['duration'],
+                        'hash': digest
+                    },
+                    upsert=True
+                ))
+            if any(index >= len(chunks) for index in existing_hashes):
+                operations.append(DeleteMany({'video_id': video_id, 'chunk_index': {'$gte': len(chunks)}}))
+            
+            size = settings.VIDEO_CHUNK_WRITE_BATCH
+            for start in range(0, len(operations), size):
+                await collection.bulk_write(operations[start:start + size], ordered=False)
+            if operations:
+                logger.info(f"Updated {len(operations)} chunks for video {video_id}")
+            
+            self.timeline_cache.invalidate(video_id)
+            return len(operations)
+            
+        except Exception as e:
+            logger.error(f"Error updating chunks in MongoDB: {str(e)}")
+            raise
+
+    async def _content_version(self, video_id: str) -> Optional[str]:
+        """
+        Version of what ingestion last wrote for a video, read from MongoDB so
+        every process sees a reprocess. None while a reprocess is in flight.
+        """
+        db = await self.mongodb
+        doc = await db['videos'].find_one(
+            {'video_id': video_id},
+            {'_id': 0, 'transcript_hash': 1, 'index_signature': 1}
+        )
+        if not doc or not doc.get('transcript_hash'):
+            return None
+        return f"{doc['transcript_hash']}|{doc.get('index_signature')}"
+
+    async def _get_chunk_timeline(self, video_id: str) -> Optional[ChunkTimeline]:
+        """Return a video's chunk timeline from the cache, loading it from MongoDB on a miss."""
+        generation = self.timeline_cache.generation(video_id)
+        version = await self._content_version(video_id)
+        timeline = self.timeline_cache.get(video_id, version)
+        if timeline is not None:
+            return timeline
+        
+        db = await self.mongodb
+        chunks = await db['video_chunks'].find(
+            {'video_id': video_id},
+            {'_id': 0, 'text': 1, 'start_time': 1, 'duration': 1}
+        ).sort('start_time', 1).to_list(length=None)
+        if not chunks:
+            return None
+        
+        timeline = ChunkTimeline.from_chunks(chunks, version)
+        self.timeline_cache.put(video_id, timeline, generation)
+        return timeline
+
+    async def _get_context_span(self, video_id: str, timestamp: float) -> Optional[Tuple[float, float]]:
+        """Time span (seconds) covered by the chunk at a timestamp and its neighbours."""
+        try:
+            if self.timeline_cache.enabled:
+                timeline = await self._get_chunk_timeline(video_id)
+                return timeline.span_at(timestamp) if timeline else None
+            
+            db = await self.mongodb
+            chunks = await db['video_chunks'].aggregate(
+                self._context_pipeline(video_id, timestamp)
+            ).to_list(length=3)
+            current = [c for c in chunks if c['start_time'] <= timestamp]
+            if not current or timestamp > current[-1]['start_time'] + current[-1]['duration']:
+                return None
+            return chunks[0]['start_time'], max(c['start_time'] + c['duration'] for c in chunks)
+        except Exception as e:
+            logger.error(f"Error getting context span from MongoDB: {str(e)}")
+            return None
+
+    def _caption_rows_between(self, table, where: Optional[str], start_ms: int, end_ms: int) -> List[Dict]:
+        """Caption rows with vectors in a time range, via the timestamp_ms scalar index. Blocking."""
+        range_filter = f"timestamp_ms >= {start_ms} AND timestamp_ms <= {end_ms}"
+        return (
+            table.to_lance()
+            .to_table(
+                columns=CAPTION_RESULT_COLUMNS + ["vector"],
+                filter=f"{where} AND {range_filter}" if where else range_filter
+            )
+            .to_pylist()
+        )
+
+    async def _budgeted_context(
+        self,
+        table,
+        where: Optional[str],
+        video_id: str,
+        query: str,
+        match_timestamp: float,
+        timings: Dict[str, float]
+    ) -> str:
+        """Best-matching sentences of the chunk window, within VIDEO_CONTEXT_TOKEN_BUDGET."""
+        span = await self._get_context_span(video_id, match_timestamp)
+        if span is None:
+            span = (match_timestamp - 60, match_timestamp + 60)
+        
+        rows = await self.executors.run_query(
+            self._caption_rows_between, table, where, int(span[0] * 1000), int(span[1] * 1000)
+        )
+        query_vector = await self.executors.run_query(self._embed_query, query)
+        context, tokens = build_context(rows, query_vector, settings.VIDEO_CONTEXT_TOKEN_BUDGET)
+        timings["context_tokens"] = tokens
+        logger.info(f"Built context of {tokens} tokens from {len(rows)} candidate sentences")
+        return context
+
     async def _get_context_from_mongodb(self, video_id: str, timestamp: float) -> Optional[str]:
         """Retrieve relevant context from MongoDB based on timestamp."""
         try:
+            if self.timeline_cache.enabled:
+                timeline = await self._get_chunk_timeline(video_id)
+                return timeline.context_at(timestamp) if timeline else None
+            
             db = await self.mongodb
             collection = db['video_chunks']
             
-            # Find the chunk containing the timestamp
-            chunk = await collection.find_one({
-                'video_id': video_id,
-                'start_time': {'$lte': timestamp},
-                '$expr': {
-                    '$lte': [timestamp, {'$add': ['$start_time', '$duration']}]
-                }
-            })
-            
-            if chunk:
-                # Get the previous and next chunks for more context
-                prev_chunk = await collection.find_one({
-                    'video_id': video_id,
-                    'chunk_index': chunk['chunk_index'] - 1
-                })
-                
-                next_chunk = await collection.find_one({
-                    'video_id': video_id,
-                    'chunk_index': chunk['chunk_index'] + 1
-                })
-                
-                # Combine chunks for context
-                context_parts = []
-                if prev_chunk:
-                    context_parts.append(prev_chunk['text'])
-                context_parts.append(chunk['text'])
-                if next_chunk:
-                    context_parts.append(next_chunk['text'])
-                
-                return ' '.join(context_parts)
+            # Previous, current and next chunk in a single indexed round trip
+            chunks = await collection.aggregate(
+                self._context_pipeline(video_id, timestamp)
+            ).to_list(length=3)
             
-            return None
+            current = [c for c in chunks if c['start_time'] <= timestamp]
+            if not current or timestamp > current[-1]['start_time'] + current[-1]['duration']:
+                return None
+            
+            # Combine chunks for context
+            return ' '.join(chunk['text'] for chunk in chunks)
             
         except Exception as e:
             logger.error(f"Error retrieving context from MongoDB: {str(e)}")
             raise
 
-    async def _store_video_details(self, video_id: str, url: str):
-        """Store video details in MongoDB."""
+    async def _store_video_details(self, video_id: str, url: str, fingerprint: Optional[Dict] = None):
+        """Store video details, and the transcript fingerprint when given, in MongoDB."""
         try:
             db = await self.mongodb
             collection = db['videos']
@@ -197,8 +726,11 @@ class VideoService:
                 'url': url,
                 'title': title,
                 'created_at': datetime.utcnow(),
-                'status': 'processed'
+                'status': 'processed',
+                'error': None
             }
+            if fingerprint:
+                video_doc.update(fingerprint)
             
             # Upsert the video document
             await collection.update_one(
@@ -213,74 +745,371 @@ class VideoService:
             logger.error(f"Error storing video details: {str(e)}")
             raise
 
-    async def process_video(self, video_id: str, url: str) -> bool:
-        """Process a YouTube video transcript with vector storage and document chunks."""
+    async def _store_video_summary(self, video_id: str, chunks: List[Dict], transcript_hash: str) -> bool:
+        """
+        Summarize the chunks into chapters and an overall summary on the video document.
+
+        A failure is logged and leaves the video processed without a summary.
+        """
         try:
-            logger.info(f"Starting video processing for video_id: {video_id}")
+            summary = await self.summarizer.summarize(chunks)
+            db = await self.mongodb
+            await db['videos'].update_one(
+                {'video_id': video_id},
+                {'$set': {
+                    'summary': summary['summary'],
+                    'chapters': summary['chapters'],
+                    'summary_transcript_hash': transcript_hash,
+                    'summarized_at': datetime.utcnow()
+                }}
+            )
+            logger.info(f"Stored summary with {len(summary['chapters'])} chapters for video_id: {video_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not summarize video {video_id}: {str(e)}")
+            return False
+
+    async def set_video_status(self, video_id: str, status: str, url: Optional[str] = None, error: Optional[str] = None):
+        """Record the ingestion status of a video, creating a placeholder document if needed."""
+        try:
+            db = await self.mongodb
+            collection = db['videos']
+            
+            on_insert = {'title': 'Untitled Video', 'created_at': datetime.utcnow()}
+            if url:
+                on_insert['url'] = url
+            
+            await collection.update_one(
+                {'video_id': video_id},
+                {
+                    '$set': {'status': status, 'error': error, 'updated_at': datetime.utcnow()},
+                    '$setOnInsert': on_insert
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error updating video status: {str(e)}")
+            raise
+
+    def _index_signature(self) -> str:
+        """Settings that change what ingestion writes; a change forces a full rebuild."""
+        return "|".join(str(value) for value in (
+            settings.VIDEO_ENCODER_MODEL,
+            settings.VIDEO_STORAGE_MODE,
+            settings.VIDEO_CHUNK_WINDOW_SECONDS,
+            settings.VIDEO_CHUNK_OVERLAP_SECONDS,
+            settings.VIDEO_NORMALIZE_CAPTIONS,
+            settings.VIDEO_CAPTION_MAX_CHARS,
+            settings.VIDEO_CAPTION_MAX_SECONDS,
+            settings.VIDEO_CAPTION_MAX_GAP_SECONDS
+        ))
+
+    def _normalize_captions(self, captions: List[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+        """Merge raw captions into sentence-level rows when VIDEO_NORMALIZE_CAPTIONS is on."""
+        if not settings.VIDEO_NORMALIZE_CAPTIONS:
+            return captions, None
+        return normalize_captions(
+            captions,
+            max_chars=settings.VIDEO_CAPTION_MAX_CHARS,
+            max_seconds=settings.VIDEO_CAPTION_MAX_SECONDS,
+            max_gap_seconds=settings.VIDEO_CAPTION_MAX_GAP_SECONDS
+        )
+
+    def _caption_schema(self) -> pa.Schema:
+        """Explicit LanceDB schema of caption rows, timestamps as flat int64 milliseconds."""
+        dimension = self.encoder.get_sentence_embedding_dimension()
+        return pa.schema([
+            pa.field("video_id", pa.string()),
+            pa.field("text", pa.string()),
+            pa.field("caption_hash", pa.string()),
+            pa.field("timestamp_ms", pa.int64()),
+            pa.field("duration_ms", pa.int64()),
+            pa.field("vector", pa.list_(pa.float32(), dimension))
+        ])
+
+    def _caption_batch(self, video_id: str, captions: List[Dict], hashes: List[str]) -> pa.Table:
+        """Embed captions in batches and build their rows as an Arrow table, column by column."""
+        texts = [caption["text"] for caption in captions]
+        embeddings = self._embed_texts(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+        schema = self._caption_schema()
+        dimension = schema.field("vector").type.list_size
+        
+        return pa.table([
+            pa.array([video_id] * len(captions), pa.string()),
+            pa.array(texts, pa.string()),
+            pa.array(hashes, pa.string()),
+            pa.array([round(caption["start"] * 1000) for caption in captions], pa.int64()),
+            pa.array([round(caption["duration"] * 1000) for caption in captions], pa.int64()),
+            pa.FixedSizeListArray.from_arrays(
+                pa.array(embeddings.reshape(-1), pa.float32()), dimension
+            )
+        ], schema=schema)
+
+    def _iter_caption_batches(
+        self,
+        video_id: str,
+        captions: List[Dict],
+        hashes: List[str]
+    ) -> Iterator[pa.RecordBatch]:
+        """Embed and yield caption rows VIDEO_INGEST_BATCH_ROWS at a time."""
+        size = settings.VIDEO_INGEST_BATCH_ROWS
+        for start in range(0, len(captions), size):
+            batch = self._caption_batch(video_id, captions[start:start + size], hashes[start:start + size])
+            yield from batch.combine_chunks().to_batches()
+
+    def _indexed_columns(self, table) -> set:
+        """Columns covered by a Lance index (scalar or vector) on the table."""
+        try:
+            return {field for index in table.to_lance().list_indices() for field in index['fields']}
+        except Exception as e:
+            logger.warning(f"Could not list table indexes: {str(e)}")
+            return set()
+
+    def _update_shared_indexes(self, table):
+        """
+        Bring the shared table's indexes up to date after one video's rows changed.
+
+        Indexes that do not exist yet are built once. After that, lancedb's
+        optimize() folds the new rows into the existing indexes incrementally,
+        so the cost follows the change, not the library size. Older lancedb
+        without optimize() rebuilds only the FTS index, which does not cover rows
+        added after it was built, and retrains IVF-PQ once the table has grown by
+        VIDEO_ANN_RETRAIN_GROWTH since the last training; scalar index lookups
+        still scan rows added since. Runs under _index_lock.
+        """
+        with self._index_lock:
+            # Index from the latest version, the handle may predate another thread's commit
+            table = self.db.open_table(table.name)
+            indexed = self._indexed_columns(table)
+            for column in ("video_id", "timestamp_ms"):
+                if column not in indexed:
+                    try:
+                        # video_id keeps per-video prefilters from scanning every video's rows
+                        table.create_scalar_index(column, replace=True)
+                    except Exception as e:
+                        logger.warning(f"Warning while creating {column} index: {str(e)}")
+            
+            if hasattr(table, "optimize") and "text" in indexed:
+                try:
+                    table.optimize()
+                except Exception as e:
+                    logger.warning(f"Warning while optimizing shared table indexes: {str(e)}")
+                if "vector" not in indexed:
+                    self._maybe_create_ann_index(table)
+                return
             
-            # Drop existing table if it exists
-            table_name = f"video_{video_id}"
             try:
-                if table_name in self.db.table_names():
-                    self.db.drop_table(table_name)
+                logger.info("Rebuilding full-text search index of the shared table")
+                table.create_fts_index("text", replace=True)
             except Exception as e:
-                logger.warning(f"Error dropping existing table: {str(e)}")
+                logger.warning(f"Warning while creating FTS index: {str(e)}")
+            
+            num_rows = table.count_rows()
+            trained = self._ann_trained_rows.get(table.name)
+            if "vector" in indexed and trained is None:
+                # Trained before this process started, count growth from here
+                self._ann_trained_rows[table.name] = num_rows
+            elif "vector" not in indexed or num_rows >= trained * (1 + settings.VIDEO_ANN_RETRAIN_GROWTH):
+                self._maybe_create_ann_index(table)
+                self._ann_trained_rows[table.name] = num_rows
+
+    def _build_search_indexes(self, table):
+        if settings.VIDEO_STORAGE_MODE == "shared":
+            self._update_shared_indexes(table)
+            return
+        
+        try:
+            # BTree index so the timestamp window fallback is an indexed range scan
+            table.create_scalar_index("timestamp_ms", replace=True)
+        except Exception as e:
+            logger.warning(f"Warning while creating timestamp index: {str(e)}")
+        
+        try:
+            # Create full-text search index
+            logger.info("Creating full-text search index")
+            table.create_fts_index("text", replace=True)
+            logger.info("Successfully created full-text search index")
+        except Exception as e:
+            logger.warning(f"Warning while creating FTS index: {str(e)}")
+        
+        self._maybe_create_ann_index(table)
+
+    def _has_indexed_captions(self, video_id: str) -> bool:
+        """Whether the video's rows exist and carry caption hashes. Blocking."""
+        table_name = self._caption_table_name(video_id)
+        if table_name not in self.db.table_names():
+            return False
+        table = self.db.open_table(table_name)
+        if not {"caption_hash", "timestamp_ms"}.issubset(table.schema.names):
+            return False
+        where = self._caption_filter(video_id)
+        return table.count_rows(where) > 0 if where else True
+
+    def _index_captions(self, video_id: str, captions: List[Dict], hashes: List[str]) -> bool:
+        """Embed captions and write them batch by batch with their search indexes. Blocking."""
+        if not captions:
+            return False
+        
+        # Create new table (or replace this video's rows in the shared table)
+        table, _ = self._write_caption_batches(video_id, self._iter_caption_batches(video_id, captions, hashes))
+        self._build_search_indexes(table)
+        self.table_cache.invalidate(self._caption_table_name(video_id))
+        return True
+
+    def _merge_captions(self, video_id: str, captions: List[Dict], hashes: List[str], previous_hashes: List[str]) -> Dict:
+        """Delete removed captions and add new ones, leaving unchanged rows alone. Blocking."""
+        added_positions, removed = diff_caption_hashes(previous_hashes, hashes)
+        added = [(captions[i], hashes[i]) for i in added_positions]
+        
+        table = self._open_caption_table(video_id)
+        where = self._caption_filter(video_id)
+        for start in range(0, len(removed), 500):
+            in_list = ", ".join(f"'{digest}'" for digest in removed[start:start + 500])
+            predicate = f"caption_hash IN ({in_list})"
+            table.delete(f"{where} AND {predicate}" if where else predicate)
+        if added:
+            self._append_batches(table, self._iter_caption_batches(
+                video_id, [c for c, _ in added], [d for _, d in added]
+            ))
+        
+        if removed or added:
+            self._build_search_indexes(table)
+            self.table_cache.invalidate(self._caption_table_name(video_id))
+        return {'captions_added': len(added), 'captions_removed': len(removed)}
+
+    async def process_video(
+        self,
+        video_id: str,
+        url: str,
+        progress: Optional[Callable[[str], Awaitable[None]]] = None,
+        refresh_transcript: bool = False
+    ) -> Optional[Dict]:
+        """
+        Process a YouTube video transcript with vector storage and document chunks.
+
+        The transcript is fingerprinted and compared with the one stored for the
+        video: an unchanged transcript is a no-op, an edited one only rewrites the
+        changed captions and chunks, anything else is rebuilt in full.
+
+        `progress` is awaited with the name of each stage as it starts. The
+        transcript comes from the on-disk cache unless `refresh_transcript` is set.
+
+        Returns:
+            Optional[Dict]: The ingestion 'path' taken ("unchanged", "incremental"
+            or "full") with row counts, or None when the video has no captions
+        """
+        async def report(stage: str):
+            if progress is not None:
+                await progress(stage)
+
+        try:
+            logger.info(f"Starting video processing for video_id: {video_id}")
             
             # Get video captions
             logger.info("Fetching video transcript...")
-            captions = YouTubeTranscriptApi.get_transcript(video_id)
+            await report("fetching_transcript")
+            captions = await self.executors.run_ingest(
+                fetch_transcript, video_id, self.transcript_cache, refresh_transcript
+            )
+            
+            # Drop noise and rolling duplicates before anything is chunked or indexed
+            captions, normalization = await self.executors.run_ingest(self._normalize_captions, captions)
+            if normalization:
+                logger.info(
+                    f"Normalized {normalization['input_rows']} captions into "
+                    f"{normalization['output_rows']} rows"
+                )
             
             if not captions:
                 logger.warning("No captions found for the video")
-                return False
+                return None
+            
+            hashes, transcript_hash = await self.executors.run_ingest(fingerprint_captions, captions)
+            fingerprint = {
+                'transcript_hash': transcript_hash,
+                'caption_hashes': hashes,
+                'index_signature': self._index_signature()
+            }
+            
+            db = await self.mongodb
+            previous = await db['videos'].find_one(
+                {'video_id': video_id},
+                {'transcript_hash': 1, 'caption_hashes': 1, 'index_signature': 1, 'summary_transcript_hash': 1}
+            ) or {}
+            summarize = (
+                settings.VIDEO_SUMMARIZE_ON_INGEST
+                and previous.get('summary_transcript_hash') != transcript_hash
+            )
+            reusable = (
+                previous.get('index_signature') == fingerprint['index_signature']
+                and len(set(hashes)) == len(hashes)
+                and await self.executors.run_ingest(self._has_indexed_captions, video_id)
+            )
+            
+            if reusable and previous.get('transcript_hash') == transcript_hash:
+                logger.info(f"Transcript unchanged for video_id: {video_id}, skipping reindex")
+                await self.set_video_status(video_id, 'processed')
+                result = {'path': 'unchanged', 'captions': len(captions), 'normalization': normalization}
+                if summarize:
+                    chunks = await self.executors.run_ingest(self._create_five_minute_chunks, captions)
+                    await report("summarizing")
+                    result['summarized'] = await self._store_video_summary(video_id, chunks, transcript_hash)
+                return result
+            
+            # Forget the stored fingerprint until the new one is written, so a run
+            # failing part-way through forces a full rebuild on the next attempt
+            await db['videos'].update_one(
+                {'video_id': video_id},
+                {'$unset': {'transcript_hash': '', 'caption_hashes': '', 'index_signature': ''}}
+            )
             
             # Create and store 5-minute chunks
-            chunks = self._create_five_minute_chunks(captions)
-            await self._store_chunks_in_mongodb(video_id, chunks)
-            
-            # Process captions for vector search
-            data = []
-            for caption in captions:
-                data.append({
-                    "text": caption["text"],
-                    "metadata": {
-                        "video_id": video_id,
-                        "timestamp_ms": caption["start"] * 1000,
-                        "duration": caption["duration"]
-                    }
-                })
-            
-            # Create new table
-            if data:
-                logger.info(f"Creating table for video_{video_id}")
-                table = self.db.create_table(
-                    table_name,
-                    data=data,
-                    mode="create"
-                )
-                
-                try:
-                    # Create full-text search index
-                    logger.info("Creating full-text search index")
-                    table.create_fts_index(["text"])
-                    logger.info("Successfully created full-text search index")
-                except Exception as e:
-                    logger.warning(f"Warning while creating FTS index: {str(e)}")
-                    pass
-                
-                # Store video details in MongoDB
-                await self._store_video_details(video_id, url)
-                
-                logger.info("Video processing completed successfully")
-                return True
-            
-            logger.warning("No captions were found for the video")
-            return False
+            await report("storing_chunks")
+            chunks = await self.executors.run_ingest(self._create_five_minute_chunks, captions)
+            
+            if reusable and previous.get('caption_hashes'):
+                # Embed, write and index only the captions that changed
+                result = {'path': 'incremental', 'captions': len(captions), 'normalization': normalization}
+                result['chunks_written'] = await self._update_chunks_in_mongodb(video_id, chunks)
+                await report("indexing_captions")
+                result.update(await self.executors.run_ingest(
+                    self._merge_captions, video_id, captions, hashes, previous['caption_hashes']
+                ))
+            else:
+                result = {'path': 'full', 'captions': len(captions), 'normalization': normalization}
+                await self._store_chunks_in_mongodb(video_id, chunks)
+                result['chunks_written'] = len(chunks)
+                # Embed, write and index captions off the event loop
+                await report("indexing_captions")
+                await self.executors.run_ingest(self._index_captions, video_id, captions, hashes)
+            
+            # Store video details in MongoDB
+            await report("storing_details")
+            await self._store_video_details(video_id, url, fingerprint)
+            
+            if summarize:
+                await report("summarizing")
+                result['summarized'] = await self._store_video_summary(video_id, chunks, transcript_hash)
+            
+            # Cached answers may quote the previous transcript
+            self.answer_cache.invalidate(video_id)
+            
+            logger.info(f"Video processing completed successfully ({result['path']})")
+            return result
             
         except Exception as e:
             logger.error(f"Error processing video: {str(e)}", exc_info=True)
             raise Exception(f"Failed to process video: {str(e)}")
 
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss counters of the in-process caches."""
+        return {
+            'timeline_cache': self.timeline_cache.stats(),
+            'table_cache': self.table_cache.stats(),
+            'prefetches_in_flight': len(self._prefetches),
+            'answer_cache': self.answer_cache.stats()
+        }
+
     def _convert_mongo_doc(self, doc):
         """Convert MongoDB document to a serializable dictionary."""
         if doc is None:
@@ -297,71 +1126,229 @@ class VideoService:
         try:
             db = await self.mongodb
             collection = db['videos']
-            videos = await collection.find().sort('created_at', -1).to_list(length=None)
+            videos = await collection.find({}, VIDEO_DOC_PROJECTION).sort('created_at', -1).to_list(length=None)
             # Convert each document to a serializable format
             return [self._convert_mongo_doc(video) for video in videos]
         except Exception as e:
             logger.error(f"Error fetching videos: {str(e)}")
             raise
 
+    @staticmethod
+    def _encode_cursor(doc: Dict) -> str:
+        payload = json.dumps({'created_at': doc['created_at'].isoformat(), 'id': str(doc['_id'])})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(payload['created_at']), ObjectId(payload['id'])
+        except (ValueError, KeyError, TypeError, InvalidId):
+            raise ValueError("Invalid cursor")
+
+    async def list_videos(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Get one page of videos, newest first, using keyset pagination.
+
+        Pages are read from the (created_at, _id) index starting after the
+        `cursor` returned by the previous page, so every page costs the same
+        whatever its depth. Only `fields` (default VIDEO_LIST_FIELDS) are returned.
+
+        Returns:
+            Dict: 'items' and 'next_cursor', None on the last page
+        """
+        fields = fields or VIDEO_LIST_FIELDS
+        unknown = set(fields) - set(VIDEO_LIST_FIELDS) - set(VIDEO_LIST_OPTIONAL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        
+        query = {}
+        if cursor:
+            created_at, last_id = self._decode_cursor(cursor)
+            query = {'$or': [
+                {'created_at': {'$lt': created_at}},
+                {'created_at': created_at, '_id': {'$lt': last_id}}
+            ]}
+        
+        try:
+            db = await self.mongodb
+            projection = {field: 1 for field in fields}
+            projection['created_at'] = 1
+            docs = await db['videos'].find(query, projection).sort(
+                [('created_at', -1), ('_id', -1)]
+            ).limit(limit + 1).to_list(length=limit + 1)
+        except Exception as e:
+            logger.error(f"Error listing videos: {str(e)}")
+            raise
+        
+        page = docs[:limit]
+        next_cursor = self._encode_cursor(page[-1]) if len(docs) > limit else None
+        return {
+            'items': [{field: doc.get(field) for field in fields} for doc in page],
+            'next_cursor': next_cursor
+        }
+
+    def _warm_caption_table(self, video_id: str):
+        """Open a video's table into the handle cache and load its FTS index. Blocking."""
+        table = self._open_caption_table(video_id)
+        self._search_fts(table, "the", 1, self._caption_filter(video_id))
+
+    async def _prefetch_video(self, video_id: str):
+        started = time.perf_counter()
+        try:
+            await self.executors.run_query(self._warm_caption_table, video_id)
+            if self.timeline_cache.enabled:
+                await self._get_chunk_timeline(video_id)
+            logger.info(f"Prefetched video {video_id} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        except Exception as e:
+            logger.warning(f"Prefetch failed for video {video_id}: {str(e)}")
+
+    def schedule_prefetch(self, video_id: str) -> bool:
+        """
+        Warm a video up in the background ahead of its first question.
+
+        Opens the caption table, touches its FTS index and loads the chunk
+        timeline. Skipped when a warm-up for the video is already running, the
+        video is already warm, or VIDEO_PREFETCH_MAX_INFLIGHT warm-ups are
+        running. Returns whether a warm-up was scheduled.
+        """
+        warm = (
+            self.table_cache.contains(self._caption_table_name(video_id))
+            and (not self.timeline_cache.enabled or self.timeline_cache.contains(video_id))
+        )
+        if (
+            warm
+            or video_id in self._prefetches
+            or len(self._prefetches) >= settings.VIDEO_PREFETCH_MAX_INFLIGHT
+        ):
+            return False
+        
+        task = asyncio.create_task(self._prefetch_video(video_id))
+        self._prefetches[video_id] = task
+        task.add_done_callback(lambda _: self._prefetches.pop(video_id, None))
+        return True
+
     async def get_video_by_id(self, video_id: str):
-        """Get video details by ID."""
+        """Get video details by ID, warming the video up for questions when it is processed."""
         try:
             db = await self.mongodb
             collection = db['videos']
-            video = await collection.find_one({'video_id': video_id})
+            video = await collection.find_one({'video_id': video_id}, VIDEO_DOC_PROJECTION)
+            if video is not None and video.get('status', 'processed') == 'processed':
+                self.schedule_prefetch(video_id)
             return self._convert_mongo_doc(video)
         except Exception as e:
             logger.error(f"Error fetching video: {str(e)}")
             raise
 
-    async def query_video_content(self, video_id: str, query: str) -> Tuple[str, Optional[float]]:
-        """Query video content and return response with timestamp."""
+    async def get_video_summary(self, video_id: str) -> Optional[Dict]:
+        """Get the precomputed summary and chapters of a video, or None if it has none."""
         try:
-            logger.info(f"Querying video content for video_id: {video_id} with query: {query}")
-            
-            # TODO: change to store by collection
-            table = self.db.open_table(f"video_{video_id}")
-            
-            # First find the exact match
-            exact_results = (
-                table.search(query)
-                .limit(1)
-                .select(["text", "metadata"])
-                .to_list()
+            db = await self.mongodb
+            collection = db['videos']
+            video = await collection.find_one(
+                {'video_id': video_id, 'summary': {'$exists': True}},
+                {'_id': 0, 'video_id': 1, 'title': 1, 'summary': 1, 'chapters': 1, 'summarized_at': 1}
             )
-            
-            if exact_results:
-                match_timestamp = exact_results[0]['metadata']['timestamp_ms'] / 1000
-                
-                # Get broader context from MongoDB
-                context = await self._get_context_from_mongodb(video_id, match_timestamp)
-                
-                if not context:
-                    # Fallback to vector search context if MongoDB fails
-                    window_results = (
-                        table.search("*")
-                        .where(f"metadata.timestamp_ms >= {match_timestamp * 1000 - 60000} AND metadata.timestamp_ms <= {match_timestamp * 1000 + 60000}")
-                        .select(["text", "metadata"])
-                        .to_list()
-                    )
-                    
-                    # Sort by timestamp
-                    window_results.sort(key=lambda x: x['metadata']['timestamp_ms'])
-                    
-                    # Build context with clear minute:second timestamps
-                    context_parts = []
-                    for result in window_results:
-                        timestamp = result['metadata']['timestamp_ms'] / 1000
-                        minutes = int(timestamp // 60)
-                        seconds = int(timestamp % 60)
-                        context_parts.append(f"[{minutes}:{seconds:02d}] {result['text']}")
-                    
-                    context = "\n".join(context_parts)
-                
-                logger.info("Generating response using OpenAI")
-                
-                prompt = f"""
+            return video
+        except Exception as e:
+            logger.error(f"Error fetching video summary: {str(e)}")
+            raise
+
+    def _window_context(self, table, where: Optional[str], match_timestamp: float) -> str:
+        """Build a ±60s caption window around a timestamp straight from LanceDB."""
+        match_ms = int(match_timestamp * 1000)
+        window_filter = f"timestamp_ms >= {match_ms - 60000} AND timestamp_ms <= {match_ms + 60000}"
+        if where:
+            window_filter = f"{where} AND {window_filter}"
+        # Plain filtered scan (no search query), served by the timestamp_ms scalar index
+        window_results = (
+            table.to_lance()
+            .to_table(columns=CAPTION_RESULT_COLUMNS, filter=window_filter)
+            .to_pylist()
+        )
+        
+        # Sort by timestamp
+        window_results.sort(key=lambda x: x['timestamp_ms'])
+        
+        # Build context with clear minute:second timestamps
+        context_parts = []
+        for result in window_results:
+            timestamp = result['timestamp_ms'] / 1000
+            minutes = int(timestamp // 60)
+            seconds = int(timestamp % 60)
+            context_parts.append(f"[{minutes}:{seconds:02d}] {result['text']}")
+        
+        return "\n".join(context_parts)
+
+    async def _prepare_answer(
+        self,
+        video_id: str,
+        query: str,
+        options: RetrievalOptions,
+        timings: Dict[str, float]
+    ) -> PreparedAnswer:
+        """Resolve a question up to the point where the LLM has to be called."""
+        started = time.perf_counter()
+        
+        if is_overview_question(query):
+            # Questions about the whole video are answered from the stored summary
+            summary = await self.get_video_summary(video_id)
+            timings["summary_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            if summary is not None:
+                logger.info(f"Answering overview question from the stored summary of {video_id}")
+                return PreparedAnswer(timestamp=None, answer=format_overview(summary))
+        
+        query_embedding = None
+        content_version = None
+        if self.answer_cache.enabled:
+            query_embedding = await self.executors.run_query(self._embed_query, query)
+            content_version = await self._content_version(video_id)
+            cached = self.answer_cache.lookup(video_id, query_embedding, content_version)
+            timings["answer_cache_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            if cached is not None:
+                logger.info(f"Answer cache hit for video_id: {video_id}")
+                return PreparedAnswer(timestamp=cached.timestamp, answer=cached.answer)
+        
+        table = await self.executors.run_query(self._open_caption_table, video_id)
+        table_columns = await self.executors.run_query(self._table_columns, table)
+        where = self._caption_filter(video_id)
+        if "timestamp_ms" not in table_columns:
+            raise ValueError(
+                "Captions table uses the legacy metadata layout, run scripts.migrate_caption_schema"
+            )
+        
+        # First find the best match (lexical, semantic or fused depending on the mode)
+        exact_results = await self._retrieve(table, query, options, timings, where, table_columns=table_columns)
+        timings["retrieval_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        if not exact_results:
+            logger.warning("No relevant content found in the video")
+            return PreparedAnswer(
+                timestamp=None,
+                answer="I couldn't find any discussion about that topic in the video."
+            )
+        
+        match_timestamp = exact_results[0]['timestamp_ms'] / 1000
+        
+        stage_started = time.perf_counter()
+        if settings.VIDEO_CONTEXT_TOKEN_BUDGET > 0 and "vector" in table_columns:
+            # Only the sentences of the chunk window that best match the question
+            context = await self._budgeted_context(table, where, video_id, query, match_timestamp, timings)
+        else:
+            # Get broader context from MongoDB
+            context = await self._get_context_from_mongodb(video_id, match_timestamp)
+            if not context:
+                # Fallback to vector search context if MongoDB fails
+                context = await self.executors.run_query(self._window_context, table, where, match_timestamp)
+        timings["context_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+        
+        prompt = f"""
                 Here is a segment from the video transcript:
 
                 {context}
@@ -370,36 +1357,294 @@ class VideoService:
                 Be specific and accurate to the transcript content.
                 DO NOT add any external information not present in this transcript.
                 """
-                
-                response = openai.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": """You are an assistant that answers questions based on video transcript segments.
-                            Your responses must:
-                            1. Only use information explicitly stated in the transcript
-                            2. Be specific about what's being discussed
-                            3. Include relevant details and comparisons mentioned
-                            4. Never add external information or assumptions
-                            5. If features or technical details are mentioned, include them"""
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=250
+        
+        messages = [
+            {
+                "role": "system", 
+                "content": """You are an assistant that answers questions based on video transcript segments.
+                Your responses must:
+                1. Only use information explicitly stated in the transcript
+                2. Be specific about what's being discussed
+                3. Include relevant details and comparisons mentioned
+                4. Never add external information or assumptions
+                5. If features or technical details are mentioned, include them"""
+            },
+            {"role": "user", "content": prompt}
+        ]
+        return PreparedAnswer(
+            timestamp=match_timestamp,
+            messages=messages,
+            query_embedding=query_embedding,
+            content_version=content_version
+        )
+
+    async def query_video_content(
+        self,
+        video_id: str,
+        query: str,
+        options: Optional[RetrievalOptions] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Query video content and return response with timestamp.
+
+        When a `timings` dict is passed it is filled with per-stage latencies in ms.
+        """
+        try:
+            logger.info(f"Querying video content for video_id: {video_id} with query: {query}")
+            options = options or RetrievalOptions()
+            timings = timings if timings is not None else {}
+            started = time.perf_counter()
+            
+            prepared = await self._prepare_answer(video_id, query, options, timings)
+            if prepared.answer is not None:
+                timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                return prepared.answer, prepared.timestamp
+            
+            logger.info("Generating response using OpenAI")
+            stage_started = time.perf_counter()
+            response = await self.openai_client.chat.completions.create(
+                model=OPENAI_CHAT_MODEL,
+                messages=prepared.messages,
+                temperature=0.1,
+                max_tokens=250
+            )
+            
+            answer = response.choices[0].message.content
+            timings["llm_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+            timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            
+            if prepared.query_embedding is not None:
+                self.answer_cache.put(
+                    video_id, prepared.query_embedding, answer, prepared.timestamp, prepared.content_version
                 )
-                
-                answer = response.choices[0].message.content
-                first_timestamp = exact_results[0]['metadata']['timestamp_ms'] / 1000
-                
-                logger.info(f"Successfully generated response with timestamp: {first_timestamp}")
-                return answer, first_timestamp
-                
-            else:
-                logger.warning("No relevant content found in the video")
-                return "I couldn't find any discussion about that topic in the video.", None
+            
+            logger.info(f"Successfully generated response with timestamp: {prepared.timestamp}")
+            return answer, prepared.timestamp
 
         except Exception as e:
             logger.error(f"Error querying video content: {str(e)}", exc_info=True)
             raise Exception(f"Failed to query video content: {str(e)}")
+
+    async def stream_video_content(
+        self,
+        video_id: str,
+        query: str,
+        options: Optional[RetrievalOptions] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream an answer as events: the anchor timestamp first, then answer tokens.
+
+        Yields dicts with an 'event' name ("timestamp", "token" or "done") and a
+        JSON-serializable 'data' payload.
+        """
+        logger.info(f"Streaming video content for video_id: {video_id} with query: {query}")
+        options = options or RetrievalOptions()
+        timings = timings if timings is not None else {}
+        started = time.perf_counter()
+        
+        prepared = await self._prepare_answer(video_id, query, options, timings)
+        yield {'event': 'timestamp', 'data': {'timestamp': prepared.timestamp}}
+        
+        if prepared.answer is not None:
+            yield {'event': 'token', 'data': {'text': prepared.answer}}
+        else:
+            stage_started = time.perf_counter()
+            stream = await self.openai_client.chat.completions.create(
+                model=OPENAI_CHAT_MODEL,
+                messages=prepared.messages,
+                temperature=0.1,
+                max_tokens=250,
+                stream=True
+            )
+            
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    if not parts:
+                        timings["llm_first_token_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+                    parts.append(text)
+                    yield {'event': 'token', 'data': {'text': text}}
+            timings["llm_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+            
+            if prepared.query_embedding is not None:
+                self.answer_cache.put(
+                    video_id, prepared.query_embedding, ''.join(parts), prepared.timestamp, prepared.content_version
+                )
+        
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        yield {'event': 'done', 'data': {'timings': timings}}
+
+    def _search_video_table(
+        self,
+        video_id: str,
+        query: str,
+        options: RetrievalOptions,
+        deadline: float
+    ) -> Optional[List[Dict]]:
+        """
+        Best hits of one per-video table, tagged with the video id. Blocking.
+
+        Returns None when `deadline` (time.monotonic()) passed before the search
+        could run, so a job still queued on the pool after the caller gave up
+        costs nothing. Missing tables, and in vector mode legacy tables without
+        a vector column (whose BM25 scores cannot be ranked against distances),
+        yield no hits.
+        """
+        if time.monotonic() >= deadline:
+            return None
+        try:
+            table = self._open_caption_table(video_id)
+            names = table.schema.names
+            if "timestamp_ms" not in names or (options.mode == "vector" and "vector" not in names):
+                return []
+            if time.monotonic() >= deadline:
+                return None
+            if options.mode == "vector":
+                hits = self._search_vector(table, query, options, options.top_k)
+            else:
+                hits = self._search_fts(table, query, options.top_k)
+        except Exception as e:
+            logger.debug(f"Skipping video {video_id} in library search: {str(e)}")
+            return []
+        return [{**hit, 'video_id': video_id} for hit in hits]
+
+    async def _search_video(
+        self,
+        video_id: str,
+        query: str,
+        options: RetrievalOptions,
+        deadline: float
+    ) -> Optional[List[Dict]]:
+        """Search one per-video table on the query pool, at most VIDEO_LIBRARY_SEARCH_CONCURRENCY at once."""
+        async with self._library_search_slots:
+            return await self.executors.run_query(self._search_video_table, video_id, query, options, deadline)
+
+    async def _search_shared_library(self, query: str, options: RetrievalOptions) -> List[Dict]:
+        """One search over the shared captions table, covering every video at once."""
+        table = await self.executors.run_query(self.db.open_table, settings.VIDEO_SHARED_TABLE_NAME)
+        return await self._retrieve(table, query, options, columns=CAPTION_RESULT_COLUMNS + ["video_id"])
+
+    async def search_library(
+        self,
+        query: str,
+        options: Optional[RetrievalOptions] = None,
+        limit: int = 10,
+        offset: int = 0,
+        per_video: int = 1,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        Search the captions of every processed video and rank the hits together.
+
+        In shared storage mode this is a single search over the shared table. In
+        per-video mode the video tables are searched concurrently on the query
+        pool, at most VIDEO_LIBRARY_SEARCH_CONCURRENCY at a time and in random
+        order, and their hits merged by score (BM25 scores are per table, so
+        lexical ranks across videos are approximate). Hybrid RRF scores only
+        rank hits within one table, so per-video mode rejects the "hybrid" mode.
+        Whatever has not finished within `timeout` seconds is dropped and the
+        response is marked 'partial'; searches not started by then are skipped
+        on the pool and the ones running keep their slot until they finish.
+
+        Returns:
+            Dict: 'hits' (video_id, title, timestamp, snippet, score) for the
+            requested page, plus 'has_more', 'partial', 'searched_videos' (per-video
+            tables actually searched, None in shared mode) and per-stage 'timings'
+        """
+        options = options or RetrievalOptions()
+        timeout = settings.VIDEO_LIBRARY_SEARCH_TIMEOUT_SECONDS if timeout is None else timeout
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        
+        # One extra hit tells whether there is a next page
+        needed = (offset + limit + 1) * per_video
+        partial = False
+        if settings.VIDEO_STORAGE_MODE == "shared":
+            shared_options = replace(options, top_k=needed * settings.VIDEO_LIBRARY_OVERFETCH)
+            searched = None
+            try:
+                hits = await asyncio.wait_for(self._search_shared_library(query, shared_options), timeout)
+            except asyncio.TimeoutError:
+                hits, partial = [], True
+        else:
+            if options.mode == "hybrid":
+                raise ValueError("Hybrid retrieval is not supported for library search in per-video storage mode")
+            db = await self.mongodb
+            videos = await db['videos'].find(
+                {'status': {'$in': ['processed', None]}},
+                {'_id': 0, 'video_id': 1}
+            ).to_list(length=None)
+            if options.mode != "fts":
+                # Embed once up front instead of racing every table for the cache
+                await self.executors.run_query(self._embed_query, query)
+            
+            # Visit videos in a different order each time so a timeout does not
+            # always drop the same tail of the library
+            random.shuffle(videos)
+            # Hits beyond `per_video` of a table would be dropped by the merge anyway
+            video_options = replace(options, top_k=per_video)
+            deadline = time.monotonic() + timeout
+            tasks = [
+                asyncio.create_task(self._search_video(video['video_id'], query, video_options, deadline))
+                for video in videos
+            ]
+            searched = 0
+            hits = []
+            if tasks:
+                done, pending = await asyncio.wait(tasks, timeout=timeout)
+                # Not cancelled: a cancelled task would free its slot while its
+                # query keeps running on the pool. Past the deadline they finish quickly.
+                for task in pending:
+                    self._library_stragglers.add(task)
+                    task.add_done_callback(self._library_stragglers.discard)
+                for task in tasks:
+                    if task in done and task.result() is not None:
+                        searched += 1
+                        hits.extend(task.result())
+                partial = searched < len(tasks)
+        timings["search_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        hits.sort(key=relevance, reverse=True)
+        per_video_counts: Dict[str, int] = {}
+        ranked = []
+        for hit in hits:
+            count = per_video_counts.get(hit['video_id'], 0)
+            if count < per_video:
+                per_video_counts[hit['video_id']] = count + 1
+                ranked.append(hit)
+        page = ranked[offset:offset + limit]
+        
+        db = await self.mongodb
+        titles = {
+            doc['video_id']: doc.get('title')
+            async for doc in db['videos'].find(
+                {'video_id': {'$in': list({hit['video_id'] for hit in page})}},
+                {'_id': 0, 'video_id': 1, 'title': 1}
+            )
+        }
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        return {
+            'query': query,
+            'hits': [
+                {
+                    'video_id': hit['video_id'],
+                    'title': titles.get(hit['video_id']),
+                    'timestamp': hit['timestamp_ms'] / 1000,
+                    'snippet': hit['text'][:LIBRARY_SNIPPET_CHARS],
+                    'score': round(float(relevance(hit)), 6)
+                }
+                for hit in page
+            ],
+            'offset': offset,
+            'limit': limit,
+            'has_more': len(ranked) > offset + limit,
+            'partial': partial,
+            'searched_videos': searched,
+            'timings': timings
+        }
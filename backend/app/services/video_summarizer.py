@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Matched against the whole question, so topical questions that merely contain
+# "summarize" or "chapter" ("summarize what she says about pricing") still go
+# through retrieval
+OVERVIEW_PATTERN = re.compile(
+    r"(please |can you |could you )?("
+    r"(give me |write )?(a |an |the )?(short |quick |brief )?(summary|overview|gist|tl;?dr)( of (this|the) video)?|"
+    r"summari[sz]e (this|the) video( for me)?|"
+    r"what('s| is) (this|the) video (about|on)|"
+    r"what are the (main|key) (points|topics|ideas|takeaways)( of (this|the) video)?"
+    r")( please)?",
+    re.IGNORECASE
+)
+
+def is_overview_question(query: str) -> bool:
+    """Whether a question asks about the video as a whole rather than a specific moment."""
+    return bool(OVERVIEW_PATTERN.fullmatch(query.strip().rstrip("?.! ")))
+
+def format_overview(summary: Dict) -> str:
+    """Render a stored summary and its chapters as a chat answer."""
+    lines = [summary['summary'], "", "Chapters:"]
+    for chapter in summary['chapters']:
+        seconds = int(chapter['start'])
+        lines.append(f"[{seconds // 60}:{seconds % 60:02d}] {chapter['title']}")
+    return "\n".join(lines)
+
+class VideoSummarizer:
+    """
+    Map-reduce summarization of a transcript over its 5-minute chunks.
+
+    Each chunk is summarized into a chapter (title + short summary) concurrently,
+    at most `concurrency` requests at a time, then the chapter summaries are
+    reduced into one overall summary.
+    """
+
+    def __init__(self, openai_client, model: str, concurrency: int):
+        self.openai_client = openai_client
+        self.model = model
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        async with self.semaphore:
+            response = await self.openai_client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You summarize video transcripts. Only use information stated in the transcript."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=max_tokens
+            )
+        return response.choices[0].message.content.strip()
+
+    async def _summarize_chunk(self, chunk: Dict) -> Dict:
+        content = await self._complete(
+            f"""
+            Here is a segment from a video transcript:
+
+            {chunk['text']}
+
+            Reply with a JSON object with a short "title" (at most 8 words) for this
+            segment and a one or two sentence "summary" of it.
+            """,
+            max_tokens=150
+        )
+        try:
+            parsed = json.loads(content[content.find('{'):content.rfind('}') + 1])
+            title, summary = parsed['title'], parsed['summary']
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Chunk summary was not valid JSON, using the raw reply")
+            title, summary = content.split('\n', 1)[0][:80], content
+        return {
+            'title': title,
+            'summary': summary,
+            'start': chunk['start'],
+            'end': chunk['start'] + chunk['duration']
+        }
+
+    async def summarize(self, chunks: List[Dict]) -> Dict:
+        """
+        Summarize a transcript from its chunks.
+
+        Returns:
+            Dict: 'summary' (str) and 'chapters', a list of dicts with 'title',
+            'summary', 'start' and 'end' (seconds)
+        """
+        chapters = await asyncio.gather(*(self._summarize_chunk(chunk) for chunk in chunks))
+
+        outline = "\n".join(
+            f"[{int(c['start']) // 60}:{int(c['start']) % 60:02d}] {c['title']}: {c['summary']}"
+            for c in chapters
+        )
+        summary = await self._complete(
+            f"""
+            Here are the summaries of consecutive segments of a video:
+
+            {outline}
+
+            Write a concise overall summary of the video in at most five sentences.
+            """,
+            max_tokens=300
+        )
+        return {'summary': summary, 'chapters': list(chapters)}
@@ -1,6 +1,6 @@
 import yt_dlp
 import os
-from youtube_transcript_api import YouTubeTranscriptApi
+from ..services.transcript_cache import fetch_transcript
 
 def download_video(url: str, output_dir: str) -> str:
     """
@@ -42,7 +42,7 @@ def get_transcript_vtt(url: str, output_dir: str) -> str:
     """
     try:
         video_id = url.split("watch?v=")[-1]
-        transcript = YouTubeTranscriptApi.get_transcript(video_id)
+        transcript = fetch_transcript(video_id)
         
         # Convert to VTT format
         vtt_content = "WEBVTT\n\n"
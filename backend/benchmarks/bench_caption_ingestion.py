@@ -0,0 +1,86 @@
+"""
+Compare LanceDB caption ingestion throughput: list of dicts vs Arrow columns.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_caption_ingestion --rows 10000 100000
+
+The "dicts" path is the previous layout: a Python dict per caption with a
+nested metadata struct, leaving schema inference and conversion to LanceDB.
+The "arrow" path builds a pyarrow.Table column by column with the explicit
+caption schema used by VideoService. Random vectors stand in for embeddings so
+only table construction and the write are measured.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+DIMENSION = 384
+
+
+def dict_rows(starts, durations, texts, vectors):
+    return [
+        {
+            "video_id": "bench",
+            "text": text,
+            "vector": vector,
+            "metadata": {"video_id": "bench", "timestamp_ms": start * 1000, "duration": duration},
+        }
+        for start, duration, text, vector in zip(starts, durations, texts, vectors)
+    ]
+
+
+def arrow_table(starts, durations, texts, vectors):
+    schema = pa.schema([
+        pa.field("video_id", pa.string()),
+        pa.field("text", pa.string()),
+        pa.field("caption_hash", pa.string()),
+        pa.field("timestamp_ms", pa.int64()),
+        pa.field("duration_ms", pa.int64()),
+        pa.field("vector", pa.list_(pa.float32(), DIMENSION)),
+    ])
+    return pa.table([
+        pa.array(["bench"] * len(texts), pa.string()),
+        pa.array(texts, pa.string()),
+        pa.array([f"{i:016x}" for i in range(len(texts))], pa.string()),
+        pa.array(np.round(starts * 1000).astype(np.int64)),
+        pa.array(np.round(durations * 1000).astype(np.int64)),
+        pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), DIMENSION),
+    ], schema=schema)
+
+
+def timed_write(directory: str, name: str, build) -> float:
+    db = lancedb.connect(directory)
+    started = time.perf_counter()
+    db.create_table(name, data=build(), mode="overwrite")
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    directory = tempfile.mkdtemp(prefix="caption-ingestion-")
+    try:
+        print(f"{'rows':>8} {'dicts rows/s':>14} {'arrow rows/s':>14} {'speedup':>8}")
+        for count in args.rows:
+            durations = rng.uniform(1.0, 4.0, count)
+            starts = np.cumsum(durations)
+            texts = [f"caption number {i} with some words" for i in range(count)]
+            vectors = rng.standard_normal((count, DIMENSION)).astype(np.float32)
+
+            legacy = timed_write(directory, "dicts", lambda: dict_rows(starts, durations, texts, vectors))
+            arrow = timed_write(directory, "arrow", lambda: arrow_table(starts, durations, texts, vectors))
+            print(f"{count:>8} {count / legacy:>14.0f} {count / arrow:>14.0f} {legacy / arrow:>7.1f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Measure chat latency before and during ingestion.
+
+Usage (from the backend directory, with MongoDB and the usual .env available):
+    python -m benchmarks.bench_chat_under_ingestion VIDEO_ID URL [URL ...] \\
+        --question "how is the model trained" --question "what does the loss show" \\
+        --requests 200 --concurrency 8
+
+The script starts its own API server with the answer cache disabled
+(VIDEO_ANSWER_CACHE_MAX_ENTRIES=0) and OPENAI_BASE_URL pointing at an
+in-process stub that answers every completion instantly. Every chat request
+therefore runs retrieval (query embedding, LanceDB search and context lookup)
+on the query pool, and the numbers exclude OpenAI latency.
+
+Phase 1 sends chat requests for VIDEO_ID on an idle server, rotating through
+the given questions (which must be specific, not whole-video overview
+questions answered from the stored summary). Phase 2 starts a bulk ingestion
+of the given URLs (force=true) and sends the same load while it runs. With
+blocking calls offloaded to the dedicated executors the p99 of both phases
+should stay close.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import httpx
+import numpy as np
+
+from app.services.video_summarizer import is_overview_question
+
+DEFAULT_QUESTIONS = [
+    "how is the model trained",
+    "what does the loss curve show",
+    "which dataset is used",
+    "how are the layers initialized",
+    "what happens when the learning rate is too high",
+    "how is the data split for evaluation",
+]
+STUB_ANSWER = "Stub answer."
+
+
+class StubCompletions(BaseHTTPRequestHandler):
+    """Answers OpenAI chat completion requests with a fixed, non-streamed reply."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "stub",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": STUB_ANSWER},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_api(port: int, stub_port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "VIDEO_ANSWER_CACHE_MAX_ENTRIES": "0",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError("API server did not become ready in time")
+
+
+async def chat_load(
+    client: httpx.AsyncClient,
+    video_id: str,
+    questions: List[str],
+    requests: int,
+    concurrency: int
+) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(question: str):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/videos/chat", json={"videoId": video_id, "message": question})
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(questions[i % len(questions)]) for i in range(requests)))
+    return latencies
+
+
+async def ingest(client: httpx.AsyncClient, urls: List[str]):
+    async with client.stream("POST", "/api/videos/process/bulk", json={"urls": urls, "force": True}) as response:
+        async for line in response.aiter_lines():
+            if line:
+                print(f"  ingested: {line}")
+
+
+def report(name: str, latencies: List[float]):
+    values = np.array(latencies)
+    print(
+        f"{name:<18} n={len(values):<5} p50={np.percentile(values, 50):8.1f} ms "
+        f"p99={np.percentile(values, 99):8.1f} ms max={values.max():8.1f} ms"
+    )
+
+
+async def run(args, questions: List[str]):
+    stub = start_stub()
+    server = start_api(args.port, stub.server_address[1])
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=300) as client:
+            await wait_ready(client, server, args.startup_timeout)
+
+            idle = await chat_load(client, args.video_id, questions, args.requests, args.concurrency)
+
+            ingestion = asyncio.create_task(ingest(client, args.urls))
+            await asyncio.sleep(args.ingest_delay)
+            busy = await chat_load(client, args.video_id, questions, args.requests, args.concurrency)
+            ingestion_running = not ingestion.done()
+            await ingestion
+    finally:
+        server.terminate()
+        server.wait()
+        stub.shutdown()
+
+    report("idle", idle)
+    report("during ingestion", busy)
+    if not ingestion_running:
+        print("warning: ingestion finished before the load phase did, use longer videos")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_id", help="An already processed video to chat with")
+    parser.add_argument("urls", nargs="+", help="Videos to ingest during the second phase")
+    parser.add_argument("--question", action="append", dest="questions",
+                        help="A specific question about VIDEO_ID, repeat to rotate through several")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--ingest-delay", type=float, default=1.0, help="Seconds to let ingestion start")
+    parser.add_argument("--port", type=int, default=8011, help="Port of the API server started for the run")
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    questions = args.questions or DEFAULT_QUESTIONS
+    overview = [question for question in questions if is_overview_question(question)]
+    if overview:
+        parser.error(f"overview questions are answered from the stored summary, not retrieval: {overview}")
+    asyncio.run(run(args, questions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark caption embedding throughput in-process vs the multi-process pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_embedding_pool --texts 8192 --workers 1 2 4 8 --torch-threads 1
+
+Encodes a fixed synthetic caption corpus with the configured encoder, first
+in-process with torch's default thread count (the path without a pool), then
+through EmbeddingPool at each worker count. Worker start-up and model loading
+are excluded by warming the pool before timing. The worker list defaults to
+1, 2, 4 and the number of CPUs.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.embedding_pool import EmbeddingPool
+from app.services.encoder_backends import load_encoder
+
+WORDS = ["model", "training", "data", "gradient", "layer", "loss", "token", "batch", "memory", "kernel",
+         "so", "we", "can", "see", "that", "the", "next", "step", "is", "really"]
+
+
+def corpus(count: int):
+    rng = np.random.default_rng(0)
+    return [" ".join(rng.choice(WORDS, rng.integers(6, 16))) for _ in range(count)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=8192)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cpus}))
+    parser.add_argument("--torch-threads", type=int, default=1)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    texts = corpus(args.texts)
+    encoder = load_encoder(settings.VIDEO_ENCODER_MODEL, settings.VIDEO_ENCODER_BACKEND)
+    encoder.encode(texts[:64], batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE)
+
+    started = time.perf_counter()
+    reference = encoder.encode(
+        texts,
+        batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    baseline = args.texts / (time.perf_counter() - started)
+    print(f"{cpus} CPUs, {args.texts} texts, {args.torch_threads} torch thread(s) per worker")
+    print(f"{'backend':>12} {'texts/s':>10} {'speedup':>8} {'max |diff|':>11}")
+    print(f"{'in-process':>12} {baseline:>10.0f} {1.0:>7.2f}x {0.0:>11.1e}")
+
+    for workers in args.workers:
+        pool = EmbeddingPool(
+            settings.VIDEO_ENCODER_MODEL,
+            dimension=encoder.get_sentence_embedding_dimension(),
+            workers=workers,
+            torch_threads=args.torch_threads,
+            batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE,
+            backend=settings.VIDEO_ENCODER_BACKEND
+        )
+        try:
+            pool.warm_up()
+            pool.encode(texts[:workers * 64])
+            started = time.perf_counter()
+            embeddings = pool.encode(texts)
+            throughput = args.texts / (time.perf_counter() - started)
+        finally:
+            pool.shutdown()
+        difference = float(np.abs(embeddings - reference).max())
+        print(f"{f'{workers} workers':>12} {throughput:>10.0f} {throughput / baseline:>7.2f}x {difference:>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare encoder backends: agreement with fp32, encode latency and memory.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_encoder_backends --backends torch torch-int8 onnx-int8 --texts 2000
+
+Each backend is loaded in a fresh process and encodes the same fixed corpus of
+synthetic captions. For every backend the script reports the mean and minimum
+cosine similarity of its embeddings to the fp32 "torch" ones, how often the
+nearest caption of each query matches the fp32 nearest caption, single-query
+latency (p50/p95, the chat path), batch throughput (the ingestion path) and
+the process peak RSS after loading and encoding. "onnx-int8" needs the
+optional optimum[onnxruntime] package and is skipped without it.
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.encoder_backends import ENCODER_BACKENDS, load_encoder
+
+WORDS = ["model", "training", "data", "gradient", "layer", "loss", "token", "batch", "memory", "kernel",
+         "so", "we", "can", "see", "that", "the", "next", "step", "is", "really", "video", "python"]
+
+
+def corpus(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, rng.integers(6, 20))) for _ in range(count)]
+
+
+def run(backend: str, texts, queries):
+    settings = get_settings()
+    encoder = load_encoder(settings.VIDEO_ENCODER_MODEL, backend)
+    encode = lambda batch: encoder.encode(
+        batch,
+        batch_size=settings.VIDEO_EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    ).astype(np.float32)
+    encode(texts[:8])
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        encode([query])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    embeddings = encode(texts)
+    throughput = len(texts) / (time.perf_counter() - started)
+    query_embeddings = encode(queries)
+    # ru_maxrss is in KiB on Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return embeddings, query_embeddings, np.array(latencies), throughput, rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = corpus(args.texts, seed=0)
+    queries = corpus(args.queries, seed=1)
+    context = multiprocessing.get_context("spawn")
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+
+    reference = None
+    print(f"{'backend':>11} {'mean cos':>9} {'min cos':>8} {'top1 agree':>11} "
+          f"{'q p50 ms':>9} {'q p95 ms':>9} {'texts/s':>8} {'RSS MB':>7}")
+    for backend in backends:
+        try:
+            with context.Pool(1) as pool:
+                embeddings, query_embeddings, latencies, throughput, rss_mb = pool.apply(run, (backend, texts, queries))
+        except RuntimeError as e:
+            print(f"{backend:>11} skipped: {e}")
+            continue
+
+        if reference is None:
+            reference = (embeddings, query_embeddings)
+        cosines = np.sum(embeddings * reference[0], axis=1)
+        nearest = np.argmax(query_embeddings @ embeddings.T, axis=1)
+        reference_nearest = np.argmax(reference[1] @ reference[0].T, axis=1)
+        print(
+            f"{backend:>11} {cosines.mean():>9.4f} {cosines.min():>8.4f} "
+            f"{np.mean(nearest == reference_nearest):>11.1%} "
+            f"{np.percentile(latencies, 50):>9.2f} {np.percentile(latencies, 95):>9.2f} "
+            f"{throughput:>8.0f} {rss_mb:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
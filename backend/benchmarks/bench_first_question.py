@@ -0,0 +1,92 @@
+"""
+Benchmark first-question latency with and without the video page warm-up.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_first_question --videos 20 --rows 5000 --dwell-ms 500
+
+Builds one synthetic per-video caption table with an FTS index per video, then
+times the first lookup on each video the way the chat path does it: open the
+table and run a full-text search. "cold" opens the table on demand; "prefetch"
+first runs VideoService's warm-up (open into a TableHandleCache, touch the FTS
+index) in the background, waits `--dwell-ms` as if the user were reading the
+page, then asks. The Mongo timeline load is not simulated.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+from app.services.table_cache import TableHandleCache
+
+COLUMNS = ["text", "timestamp_ms", "duration_ms"]
+WORDS = ["model", "training", "data", "gradient", "layer", "loss", "token", "batch", "memory", "kernel"]
+
+
+def build_tables(db, videos: int, rows: int, rng):
+    names = []
+    for index in range(videos):
+        durations = rng.integers(1000, 4000, rows)
+        data = pa.table({
+            "text": pa.array([" ".join(rng.choice(WORDS, 8)) for _ in range(rows)]),
+            "timestamp_ms": pa.array(np.cumsum(durations).astype(np.int64)),
+            "duration_ms": pa.array(durations.astype(np.int64)),
+        })
+        table = db.create_table(f"video_{index}", data=data, mode="overwrite")
+        table.create_fts_index("text", replace=True)
+        names.append(table.name)
+    return names
+
+
+def first_question(table, query: str):
+    return table.search(query, query_type="fts").limit(1).select(COLUMNS).to_list()
+
+
+def measure(db, names, prefetch: bool, dwell_ms: float, rng) -> np.ndarray:
+    cache = TableHandleCache(len(names))
+    pool = ThreadPoolExecutor(4)
+    latencies = []
+    for name in names:
+        if prefetch:
+            def warm(name=name):
+                first_question(cache.get_or_open(name, db.open_table), "the")
+            pool.submit(warm)
+            time.sleep(dwell_ms / 1000)
+        query = " ".join(rng.choice(WORDS, 2))
+        started = time.perf_counter()
+        first_question(cache.get_or_open(name, db.open_table), query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    pool.shutdown()
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--dwell-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'mode':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for prefetch in (False, True):
+        # Fresh tables per mode so neither run benefits from the other's opens
+        directory = tempfile.mkdtemp(prefix="first-question-")
+        try:
+            db = lancedb.connect(directory)
+            names = build_tables(db, args.videos, args.rows, rng)
+            latencies = measure(lancedb.connect(directory), names, prefetch, args.dwell_ms, rng)
+            print(
+                f"{'prefetch' if prefetch else 'cold':>9} {np.percentile(latencies, 50):>8.2f} "
+                f"{np.percentile(latencies, 95):>8.2f} {latencies.max():>8.2f}"
+            )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
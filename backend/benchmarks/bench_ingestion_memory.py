@@ -0,0 +1,95 @@
+"""
+Measure peak ingestion memory against transcript length, whole-table vs batched.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_ingestion_memory --hours 1 4 12 --batch-rows 2048
+
+The "whole" path is the previous one: embed every caption, build one Arrow
+table and write it with a single create_table. The "batched" path is the one
+VideoService now uses: embed VIDEO_INGEST_BATCH_ROWS captions at a time and
+stream the RecordBatches into create_table through one RecordBatchReader. Random vectors
+stand in for embeddings. Each run happens in a fresh process and reports the
+tracemalloc peak (Python and NumPy allocations) and the Arrow memory pool peak;
+the caption list itself, shared by both paths, is allocated before tracing.
+"""
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import tracemalloc
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+DIMENSION = 384
+CAPTIONS_PER_HOUR = 1440
+SCHEMA = pa.schema([
+    pa.field("video_id", pa.string()),
+    pa.field("text", pa.string()),
+    pa.field("caption_hash", pa.string()),
+    pa.field("timestamp_ms", pa.int64()),
+    pa.field("duration_ms", pa.int64()),
+    pa.field("vector", pa.list_(pa.float32(), DIMENSION)),
+])
+
+
+def caption_table(captions, rng) -> pa.Table:
+    embeddings = rng.standard_normal((len(captions), DIMENSION)).astype(np.float32)
+    return pa.table([
+        pa.array(["bench"] * len(captions), pa.string()),
+        pa.array([caption["text"] for caption in captions], pa.string()),
+        pa.array([f"{caption['start']:016x}" for caption in captions], pa.string()),
+        pa.array([caption["start"] * 1000 for caption in captions], pa.int64()),
+        pa.array([caption["duration"] * 1000 for caption in captions], pa.int64()),
+        pa.FixedSizeListArray.from_arrays(pa.array(embeddings.reshape(-1), pa.float32()), DIMENSION),
+    ], schema=SCHEMA)
+
+
+def run(mode: str, hours: float, batch_rows: int, directory: str):
+    rng = np.random.default_rng(0)
+    captions = [
+        {"text": f"caption {i} with a handful of spoken words", "start": i * 2, "duration": 2}
+        for i in range(int(hours * CAPTIONS_PER_HOUR))
+    ]
+    db = lancedb.connect(directory)
+
+    tracemalloc.start()
+    if mode == "whole":
+        db.create_table("captions", data=caption_table(captions, rng), mode="overwrite")
+    else:
+        def batches():
+            for start in range(0, len(captions), batch_rows):
+                yield from caption_table(captions[start:start + batch_rows], rng).combine_chunks().to_batches()
+
+        reader = pa.RecordBatchReader.from_batches(SCHEMA, batches())
+        db.create_table("captions", data=reader, schema=SCHEMA, mode="overwrite")
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return python_peak, pa.default_memory_pool().max_memory()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--batch-rows", type=int, default=2048)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'hours':>6} {'captions':>9} {'mode':>8} {'python MB':>10} {'arrow MB':>9}")
+    for hours in args.hours:
+        for mode in ("whole", "batched"):
+            directory = tempfile.mkdtemp(prefix="ingestion-memory-")
+            try:
+                with context.Pool(1) as pool:
+                    python_peak, arrow_peak = pool.apply(run, (mode, hours, args.batch_rows, directory))
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+            print(
+                f"{hours:>6g} {int(hours * CAPTIONS_PER_HOUR):>9} {mode:>8} "
+                f"{python_peak / 2**20:>10.1f} {arrow_peak / 2**20:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark transcript windowing on long synthetic livestream transcripts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_transcript_windows --captions 100000 200000
+
+Compares the previous dict/string-concatenation loop against
+app.services.transcript_windows.compute_windows.
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from app.services.transcript_windows import compute_windows
+
+
+def legacy_five_minute_chunks(captions: List[Dict]) -> List[Dict]:
+    """The loop VideoService used before compute_windows (kept for comparison)."""
+    chunks = []
+    current_chunk = {'text': '', 'start': 0, 'duration': 0}
+    for caption in captions:
+        if current_chunk['duration'] >= 300:
+            chunks.append(current_chunk)
+            current_chunk = {
+                'text': caption['text'] + ' ',
+                'start': caption['start'],
+                'duration': caption['duration']
+            }
+        else:
+            current_chunk['text'] += caption['text'] + ' '
+            current_chunk['duration'] += caption['duration']
+    if current_chunk['text']:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def synthetic_captions(count: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    words = ["stream", "chat", "thanks", "for", "the", "follow", "game", "next", "level", "okay"]
+    captions = []
+    start = 0.0
+    for _ in range(count):
+        duration = rng.uniform(1.0, 4.0)
+        captions.append({
+            'text': ' '.join(rng.choices(words, k=rng.randint(3, 10))),
+            'start': start,
+            'duration': duration
+        })
+        start += duration * rng.uniform(0.6, 1.0)
+    return captions
+
+
+def best_of(func, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captions", type=int, nargs="+", default=[100_000, 200_000])
+    parser.add_argument("--window", type=float, default=300.0)
+    parser.add_argument("--overlap", type=float, default=0.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'captions':>10} {'hours':>6} {'legacy ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for count in args.captions:
+        captions = synthetic_captions(count)
+        hours = captions[-1]['start'] / 3600
+        legacy = best_of(lambda: legacy_five_minute_chunks(captions), args.repeats)
+        vectorized = best_of(lambda: compute_windows(captions, args.window, args.overlap), args.repeats)
+        print(f"{count:>10} {hours:>6.1f} {legacy:>10.1f} {vectorized:>10.1f} {legacy / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
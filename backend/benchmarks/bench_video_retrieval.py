@@ -0,0 +1,70 @@
+"""
+Compare caption retrieval quality and latency between retrieval modes.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_video_retrieval queries.json --k 5 --tolerance 15
+
+The queries file is a JSON list of labelled questions:
+    [{"video_id": "abc123", "query": "how do I reset it", "timestamp": 312.0}, ...]
+
+A query counts as recalled at k when any of the top-k captions starts within
+`tolerance` seconds of the labelled timestamp.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.video_service import VideoService, RetrievalOptions
+
+
+def run_mode(service: VideoService, queries: List[Dict], options: RetrievalOptions, tolerance: float) -> Dict:
+    latencies = []
+    hits = 0
+    for item in queries:
+        table = service._open_caption_table(item["video_id"])
+        where = service._caption_filter(item["video_id"])
+        started = time.perf_counter()
+        results = asyncio.run(service._retrieve(table, item["query"], options, where=where))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        timestamps = [row["timestamp_ms"] / 1000 for row in results]
+        if any(abs(ts - item["timestamp"]) <= tolerance for ts in timestamps):
+            hits += 1
+
+    latencies = np.array(latencies)
+    return {
+        "recall": hits / len(queries),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", help="Path to the labelled queries JSON file")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=15.0, help="Seconds")
+    parser.add_argument("--nprobes", type=int, default=None)
+    parser.add_argument("--refine-factor", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = json.load(f)
+
+    service = VideoService()
+    service.warm_up()
+
+    print(f"{len(queries)} queries, recall@{args.k} within {args.tolerance}s")
+    print(f"{'mode':<8} {'recall':>8} {'p50 ms':>10} {'p95 ms':>10}")
+    for mode in ("fts", "vector", "hybrid"):
+        options = RetrievalOptions(mode=mode, top_k=args.k, nprobes=args.nprobes, refine_factor=args.refine_factor)
+        result = run_mode(service, queries, options, args.tolerance)
+        print(f"{mode:<8} {result['recall']:>8.3f} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
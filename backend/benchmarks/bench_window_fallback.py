@@ -0,0 +1,73 @@
+"""
+Benchmark the ±60 s timestamp window fallback on long transcripts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_window_fallback --rows 100000 500000 --queries 200
+
+Builds a synthetic caption table per size and times the filtered scan used by
+VideoService._window_context at random timestamps, first without and then with
+the BTree scalar index on timestamp_ms that ingestion now creates.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+COLUMNS = ["text", "timestamp_ms", "duration_ms"]
+
+
+def build_table(db, count: int, rng):
+    durations = rng.integers(1000, 4000, count)
+    starts = np.cumsum(durations)
+    data = pa.table({
+        "video_id": pa.array(["bench"] * count),
+        "text": pa.array([f"caption {i}" for i in range(count)]),
+        "timestamp_ms": pa.array(starts.astype(np.int64)),
+        "duration_ms": pa.array(durations.astype(np.int64)),
+    })
+    return db.create_table(f"window_{count}", data=data, mode="overwrite"), starts
+
+
+def measure(table, starts, queries: int, rng) -> np.ndarray:
+    dataset = table.to_lance()
+    latencies = []
+    for match_ms in rng.choice(starts, queries):
+        window_filter = f"timestamp_ms >= {match_ms - 60000} AND timestamp_ms <= {match_ms + 60000}"
+        started = time.perf_counter()
+        dataset.to_table(columns=COLUMNS, filter=window_filter)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    directory = tempfile.mkdtemp(prefix="window-fallback-")
+    try:
+        db = lancedb.connect(directory)
+        print(f"{'rows':>8} {'hours':>6} {'index':>6} {'p50 ms':>8} {'p95 ms':>8}")
+        for count in args.rows:
+            table, starts = build_table(db, count, rng)
+            hours = starts[-1] / 3_600_000
+            for indexed in (False, True):
+                if indexed:
+                    table.create_scalar_index("timestamp_ms", replace=True)
+                latencies = measure(table, starts, args.queries, rng)
+                print(
+                    f"{count:>8} {hours:>6.1f} {'btree' if indexed else 'none':>6} "
+                    f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f}"
+                )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
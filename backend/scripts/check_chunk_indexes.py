@@ -0,0 +1,65 @@
+"""
+Check that timestamp context lookups on video_chunks are index-backed.
+
+Usage (from the backend directory):
+    python -m scripts.check_chunk_indexes VIDEO_ID [--timestamp 120]
+
+Ensures the video_chunks indexes exist, runs explain() on the aggregation used
+by VideoService._get_context_from_mongodb and exits non-zero if any stage,
+including the $unionWith branch, falls back to a COLLSCAN.
+"""
+import argparse
+import asyncio
+import sys
+from typing import Any, List
+
+from app.core.database import mongodb
+from app.services.video_service import VideoService
+
+
+def find_stages(plan: Any, name: str) -> List[Any]:
+    """Collect every plan node whose stage equals `name`, at any depth."""
+    found = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == name:
+            found.append(plan)
+        for value in plan.values():
+            found.extend(find_stages(value, name))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(find_stages(item, name))
+    return found
+
+
+async def check(video_id: str, timestamp: float) -> bool:
+    service = VideoService()
+    await service.ensure_indexes()
+    db = await service.mongodb
+
+    explain = await db.command(
+        "aggregate",
+        "video_chunks",
+        pipeline=service._context_pipeline(video_id, timestamp),
+        explain=True
+    )
+    collscans = find_stages(explain, "COLLSCAN")
+    ixscans = find_stages(explain, "IXSCAN")
+    print(f"IXSCAN stages: {len(ixscans)}, COLLSCAN stages: {len(collscans)}")
+    await mongodb.close_mongodb_connection()
+    return not collscans and bool(ixscans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_id")
+    parser.add_argument("--timestamp", type=float, default=120.0)
+    args = parser.parse_args()
+
+    if not asyncio.run(check(args.video_id, args.timestamp)):
+        print("Context lookup is not fully index-backed")
+        sys.exit(1)
+    print("Context lookup uses indexes only")
+
+
+if __name__ == "__main__":
+    main()
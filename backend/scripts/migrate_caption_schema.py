@@ -0,0 +1,91 @@
+"""
+Rewrite caption tables from the nested `metadata` layout to flat columns.
+
+Usage (from the backend directory):
+    python -m scripts.migrate_caption_schema [--dry-run]
+
+Older tables stored captions as {"text", "metadata": {"video_id",
+"timestamp_ms", "duration"}}. Every caption table (per-video `video_{id}`
+tables and the shared table) is rewritten with the explicit schema used by
+ingestion: video_id, text, caption_hash, int64 timestamp_ms / duration_ms and a
+fixed-size float32 vector. Missing vectors and caption hashes are computed.
+Search indexes are rebuilt afterwards.
+"""
+import argparse
+import logging
+
+import pyarrow as pa
+
+from app.core.config import get_settings
+from app.services.caption_fingerprint import caption_hash
+from app.services.video_service import VideoService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def convert_table(service: VideoService, source: pa.Table, video_id: str = None) -> pa.Table:
+    """
+    Convert caption rows in any historical layout to the current caption schema.
+
+    `video_id` is used for rows that do not record their own video id.
+    """
+    schema = service._caption_schema()
+    if "timestamp_ms" in source.schema.names:
+        return source.select(schema.names).cast(schema)
+
+    rows = source.to_pylist()
+    captions, hashes, video_ids = [], [], []
+    for row in rows:
+        metadata = row.get("metadata") or {}
+        caption = {
+            "text": row["text"],
+            "start": metadata["timestamp_ms"] / 1000,
+            "duration": metadata["duration"],
+        }
+        captions.append(caption)
+        hashes.append(row.get("caption_hash") or caption_hash(caption))
+        video_ids.append(row.get("video_id") or metadata.get("video_id") or video_id)
+
+    # Re-embedding keeps the vectors consistent with the current encoder
+    table = service._caption_batch(video_id or "", captions, hashes)
+    return table.set_column(
+        table.schema.get_field_index("video_id"),
+        "video_id",
+        pa.array(video_ids, pa.string())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only list the tables that need migrating")
+    args = parser.parse_args()
+
+    service = VideoService()
+    shared_name = settings.VIDEO_SHARED_TABLE_NAME
+    migrated = 0
+    for name in service.db.table_names():
+        if not (name.startswith("video_") or name == shared_name):
+            continue
+        table = service.db.open_table(name)
+        if "metadata" not in table.schema.names:
+            continue
+
+        logger.info(f"Migrating {name} ({table.count_rows()} rows)")
+        if args.dry_run:
+            continue
+
+        video_id = None if name == shared_name else name[len("video_"):]
+        converted = convert_table(service, table.to_arrow(), video_id)
+        table = service.db.create_table(name, data=converted, mode="overwrite")
+        if name == shared_name:
+            table.create_scalar_index("video_id", replace=True)
+        service._build_search_indexes(table)
+        migrated += 1
+
+    logger.info(f"Migrated {migrated} tables")
+
+
+if __name__ == "__main__":
+    main()
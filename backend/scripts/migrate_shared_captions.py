@@ -0,0 +1,69 @@
+"""
+Copy per-video `video_{id}` caption tables into the shared captions table.
+
+Usage (from the backend directory):
+    python -m scripts.migrate_shared_captions [--drop]
+
+Rows are appended to VIDEO_SHARED_TABLE_NAME in the current caption schema.
+Tables in the older nested `metadata` layout are converted (and embedded)
+during the copy. Indexes are built once after all videos are copied.
+Set VIDEO_STORAGE_MODE=shared afterwards so the service reads the new table.
+"""
+import argparse
+import logging
+
+from app.core.config import get_settings
+from app.services.video_service import VideoService
+from scripts.migrate_caption_schema import convert_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drop", action="store_true", help="Drop each per-video table after copying it")
+    args = parser.parse_args()
+
+    service = VideoService()
+    shared_name = settings.VIDEO_SHARED_TABLE_NAME
+    table_names = [
+        name for name in service.db.table_names()
+        if name.startswith("video_") and name != shared_name
+    ]
+    logger.info(f"Found {len(table_names)} per-video tables to migrate")
+
+    shared = service.db.open_table(shared_name) if shared_name in service.db.table_names() else None
+    migrated = 0
+    for name in table_names:
+        video_id = name[len("video_"):]
+        rows = convert_table(service, service.db.open_table(name).to_arrow(), video_id)
+        if rows.num_rows == 0:
+            logger.warning(f"Skipping empty table {name}")
+            continue
+
+        if shared is None:
+            shared = service.db.create_table(shared_name, data=rows, mode="create")
+        else:
+            # Re-running the migration replaces rows instead of duplicating them
+            shared.delete(f"video_id = '{video_id}'")
+            shared.add(rows)
+        migrated += 1
+        logger.info(f"Copied {rows.num_rows} captions from {name}")
+
+        if args.drop:
+            service.db.drop_table(name)
+
+    if shared is None:
+        logger.info("Nothing to migrate")
+        return
+
+    logger.info("Building indexes on the shared table")
+    shared.create_scalar_index("video_id", replace=True)
+    service._build_search_indexes(shared)
+    logger.info(f"Migrated {migrated} videos into {shared_name}")
+
+
+if __name__ == "__main__":
+    main()
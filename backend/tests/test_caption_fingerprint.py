@@ -0,0 +1,43 @@
+from app.services.caption_fingerprint import caption_hash, diff_caption_hashes, fingerprint_captions
+
+
+def caption(text, start, duration=2.0):
+    return {'text': text, 'start': start, 'duration': duration}
+
+
+OLD = [caption("one", 0.0), caption("two", 2.0), caption("three", 4.0)]
+
+
+def test_hashes_are_stable_and_cover_timing_and_text():
+    assert caption_hash(caption("one", 0.0)) == caption_hash({'start': 0, 'duration': 2, 'text': "one"})
+    assert caption_hash(caption("one", 0.0)) != caption_hash(caption("one", 0.5))
+    assert caption_hash(caption("one", 0.0)) != caption_hash(caption("One", 0.0))
+
+
+def test_transcript_hash_follows_caption_order():
+    hashes, transcript = fingerprint_captions(OLD)
+    assert hashes == [caption_hash(c) for c in OLD]
+    assert fingerprint_captions(list(OLD))[1] == transcript
+    assert fingerprint_captions(OLD[::-1])[1] != transcript
+
+
+def test_unchanged_transcript_has_no_diff():
+    hashes, _ = fingerprint_captions(OLD)
+    assert diff_caption_hashes(hashes, hashes) == ([], [])
+
+
+def test_diff_classifies_added_removed_and_unchanged():
+    old_hashes, _ = fingerprint_captions(OLD)
+    new = [OLD[0], caption("two, edited", 2.0), OLD[2], caption("four", 6.0)]
+    new_hashes, _ = fingerprint_captions(new)
+
+    added, removed = diff_caption_hashes(old_hashes, new_hashes)
+    # Captions 0 and 2 are unchanged, the edited caption replaces the old one
+    assert added == [1, 3]
+    assert removed == [old_hashes[1]]
+
+
+def test_diff_from_empty_and_to_empty():
+    hashes, _ = fingerprint_captions(OLD)
+    assert diff_caption_hashes([], hashes) == ([0, 1, 2], [])
+    assert diff_caption_hashes(hashes, []) == ([], hashes)
@@ -0,0 +1,96 @@
+from app.services.caption_normalizer import (
+    _strip_overlap,
+    clean_caption_text,
+    iter_normalized_captions,
+    normalize_captions,
+)
+
+
+def caption(text, start, duration=2.0):
+    return {'text': text, 'start': start, 'duration': duration}
+
+
+def test_clean_caption_text_strips_noise():
+    assert clean_caption_text("[Music]  so   we ♪♪ start >> here") == "so we start here"
+    assert clean_caption_text("[Applause]") == ""
+
+
+def test_strip_overlap_rolling_tail():
+    assert _strip_overlap("we can see that the", "see that the loss goes down") == "loss goes down"
+
+
+def test_strip_overlap_whole_previous_line():
+    assert _strip_overlap("so we can", "so we can see it") == "see it"
+    assert _strip_overlap("so", "so what happened") == "what happened"
+
+
+def test_strip_overlap_duplicate_line():
+    assert _strip_overlap("the same line", "the same line") == ""
+
+
+def test_strip_overlap_keeps_word_prefixes():
+    assert _strip_overlap("so", "something happened here.") == "something happened here."
+    assert _strip_overlap("I", "It works") == "It works"
+    assert _strip_overlap("and then the", "theory holds") == "theory holds"
+
+
+def test_strip_overlap_keeps_single_shared_word():
+    assert _strip_overlap("look at the", "the model") == "the model"
+
+
+def test_rolling_captions_merge_into_sentences():
+    rows = list(iter_normalized_captions([
+        caption("so today we", 0.0),
+        caption("today we will train", 2.0),
+        caption("will train a model.", 4.0),
+        caption("Next we look", 6.0),
+        caption("at the data.", 8.0),
+    ]))
+    assert rows == [
+        {'text': "so today we will train a model.", 'start': 0.0, 'duration': 6.0},
+        {'text': "Next we look at the data.", 'start': 6.0, 'duration': 4.0},
+    ]
+
+
+def test_duplicates_extend_the_row():
+    rows = list(iter_normalized_captions([
+        caption("hello there", 0.0),
+        caption("hello there", 2.0),
+        caption("everyone.", 4.0),
+    ]))
+    assert rows == [{'text': "hello there everyone.", 'start': 0.0, 'duration': 6.0}]
+
+
+def test_noise_only_captions_are_dropped():
+    rows = list(iter_normalized_captions([
+        caption("[Music]", 0.0),
+        caption("welcome back.", 2.0),
+        caption("[Applause]", 4.0),
+    ]))
+    assert rows == [{'text': "welcome back.", 'start': 2.0, 'duration': 2.0}]
+
+
+def test_pause_splits_rows():
+    rows = list(iter_normalized_captions([
+        caption("first part", 0.0),
+        caption("after a pause", 10.0),
+    ]))
+    assert [row['text'] for row in rows] == ["first part", "after a pause"]
+
+
+def test_prefix_word_is_not_cut():
+    rows = list(iter_normalized_captions([
+        caption("so", 0.0, 1.0),
+        caption("something happened here.", 1.0),
+    ]))
+    assert rows == [{'text': "so something happened here.", 'start': 0.0, 'duration': 3.0}]
+
+
+def test_normalize_captions_reports_reduction():
+    rows, stats = normalize_captions([
+        caption("one two", 0.0),
+        caption("one two three.", 2.0),
+    ])
+    assert rows == [{'text': "one two three.", 'start': 0.0, 'duration': 4.0}]
+    assert stats == {'input_rows': 2, 'output_rows': 1, 'reduction': 0.5}
+    assert normalize_captions([]) == ([], {'input_rows': 0, 'output_rows': 0, 'reduction': 0.0})
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.environ.get("MONGODB_URL"), reason="MONGODB_URL is not set")
+
+CHUNK_INDEX = "video_id_1_start_time_1"
+
+
+def winning_plans(explain):
+    """Every winningPlan in an explain result, including the $unionWith branch."""
+    found = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                found.append(value)
+            else:
+                found.extend(winning_plans(value))
+    elif isinstance(explain, list):
+        for item in explain:
+            found.extend(winning_plans(item))
+    return found
+
+
+async def explain_context_lookup(timestamp: float):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.services.video_service import VideoService
+
+    client = AsyncIOMotorClient(os.environ["MONGODB_URL"])
+    db = client[f"test_chunk_indexes_{uuid.uuid4().hex[:8]}"]
+    try:
+        # Only the MongoDB side of the service is needed, skip loading the encoder and LanceDB
+        service = VideoService.__new__(VideoService)
+        service._db = db
+        await service.ensure_indexes()
+        await db["video_chunks"].insert_many([
+            {"video_id": video_id, "chunk_index": i, "start_time": i * 300.0, "duration": 300.0, "text": f"chunk {i}"}
+            for video_id in ("a", "b", "c")
+            for i in range(50)
+        ])
+        return await db.command(
+            "aggregate",
+            "video_chunks",
+            pipeline=service._context_pipeline("a", timestamp),
+            explain=True
+        )
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+@pytest.mark.parametrize("timestamp", [0.0, 1234.0, 50 * 300.0])
+def test_context_lookup_uses_chunk_index(timestamp):
+    from scripts.check_chunk_indexes import find_stages
+
+    plans = winning_plans(asyncio.run(explain_context_lookup(timestamp)))
+    # The $match branch and the $unionWith branch
+    assert len(plans) >= 2
+    for plan in plans:
+        assert not find_stages(plan, "COLLSCAN")
+        ixscans = find_stages(plan, "IXSCAN")
+        assert ixscans
+        assert all(stage["indexName"] == CHUNK_INDEX for stage in ixscans)
@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.video_service import reciprocal_rank_fusion
+
+
+def hit(timestamp_ms, text=None, video_id=None):
+    row = {'timestamp_ms': timestamp_ms, 'text': text or f"t{timestamp_ms}"}
+    if video_id is not None:
+        row['video_id'] = video_id
+    return row
+
+
+def test_captions_in_both_lists_rank_first():
+    fts = [hit(1), hit(2), hit(3)]
+    vector = [hit(3), hit(4), hit(1)]
+    fused = reciprocal_rank_fusion([(fts, 1.0), (vector, 1.0)], k=60)
+    assert [row['timestamp_ms'] for row in fused] == [1, 3, 2, 4]
+    assert fused[0]['_rrf_score'] == pytest.approx(1 / 61 + 1 / 63)
+
+
+def test_weights_shift_the_order():
+    fts = [hit(1), hit(2)]
+    vector = [hit(2), hit(1)]
+    assert reciprocal_rank_fusion([(fts, 2.0), (vector, 1.0)], k=60)[0]['timestamp_ms'] == 1
+    assert reciprocal_rank_fusion([(fts, 1.0), (vector, 2.0)], k=60)[0]['timestamp_ms'] == 2
+
+
+def test_ties_keep_first_seen_order():
+    fts = [hit(1), hit(2)]
+    vector = [hit(2), hit(1)]
+    fused = reciprocal_rank_fusion([(fts, 1.0), (vector, 1.0)], k=60)
+    assert fused[0]['_rrf_score'] == pytest.approx(fused[1]['_rrf_score'])
+    assert [row['timestamp_ms'] for row in fused] == [1, 2]
+
+
+def test_same_caption_in_different_videos_is_not_merged():
+    fused = reciprocal_rank_fusion(
+        [([hit(1, "same", "a")], 1.0), ([hit(1, "same", "b")], 1.0)],
+        k=60
+    )
+    assert [row['video_id'] for row in fused] == ["a", "b"]
+
+
+def test_empty_lists():
+    assert reciprocal_rank_fusion([([], 1.0), ([], 1.0)], k=60) == []
@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+import json
+import os
+
+from app.services.transcript_cache import TranscriptCache, fetch_transcript
+
+CAPTIONS = [
+    {'text': "hello wörld", 'start': 0.0, 'duration': 1.5},
+    {'text': "second line", 'start': 1.5, 'duration': 2.0},
+]
+
+
+def objects(cache):
+    return sorted(os.listdir(os.path.join(cache.root, "objects")))
+
+
+def test_round_trip_is_gzip_compressed(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=1 << 20)
+    digest = cache.put("video", CAPTIONS)
+
+    assert cache.get("video") == CAPTIONS
+    with gzip.open(tmp_path / "objects" / f"{digest}.json.gz", "rb") as f:
+        assert json.loads(f.read()) == CAPTIONS
+
+
+def test_objects_are_addressed_by_content(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=1 << 20)
+    payload = json.dumps(CAPTIONS, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    assert cache.put("a", CAPTIONS) == hashlib.sha256(payload).hexdigest()
+    # Identical transcripts share one object
+    assert cache.put("b", list(CAPTIONS)) == cache.put("a", CAPTIONS)
+    assert len(objects(cache)) == 1
+    cache.put("b", CAPTIONS[:1])
+    assert len(objects(cache)) == 2
+    assert cache.get("a") == CAPTIONS
+    assert cache.get("b") == CAPTIONS[:1]
+
+
+def test_misses_and_invalidate(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=1 << 20)
+    assert cache.get("missing") is None
+    cache.put("video", CAPTIONS)
+    cache.invalidate("video")
+    assert cache.get("video") is None
+
+
+def test_eviction_keeps_the_cache_within_budget(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=1)
+    cache.put("video", CAPTIONS)
+    assert objects(cache) == []
+    assert cache.get("video") is None
+
+
+def test_fetch_transcript_prefers_the_cache(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=1 << 20)
+    cache.put("video", CAPTIONS)
+    assert fetch_transcript("video", cache) == CAPTIONS
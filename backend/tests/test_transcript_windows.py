@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.transcript_windows import compute_windows
+
+
+def caption(text, start, duration=10.0):
+    return {'text': text, 'start': start, 'duration': duration}
+
+
+CAPTIONS = [caption(f"c{i}", i * 10.0) for i in range(7)]  # starts 0, 10, ..., 60
+
+
+def test_windows_without_overlap():
+    windows = compute_windows(CAPTIONS, window_seconds=30.0)
+    assert windows == [
+        {'text': "c0 c1 c2", 'start': 0.0, 'duration': 30.0},
+        {'text': "c3 c4 c5", 'start': 30.0, 'duration': 30.0},
+        {'text': "c6", 'start': 60.0, 'duration': 10.0},
+    ]
+
+
+def test_caption_on_a_boundary_starts_the_next_window():
+    windows = compute_windows([caption("a", 0.0), caption("b", 30.0)], window_seconds=30.0)
+    assert [window['text'] for window in windows] == ["a", "b"]
+
+
+def test_windows_with_overlap():
+    windows = compute_windows(CAPTIONS, window_seconds=30.0, overlap_seconds=10.0)
+    assert [(window['text'], window['start']) for window in windows] == [
+        ("c0 c1 c2", 0.0),
+        ("c2 c3 c4", 20.0),
+        ("c4 c5 c6", 40.0),
+    ]
+
+
+def test_trailing_window_without_new_captions_is_dropped():
+    windows = compute_windows(CAPTIONS[:3], window_seconds=30.0, overlap_seconds=20.0)
+    assert [window['text'] for window in windows] == ["c0 c1 c2"]
+
+
+def test_gaps_skip_empty_windows_and_unsorted_input_is_ordered():
+    windows = compute_windows([caption("late", 100.0), caption("early", 0.0)], window_seconds=30.0)
+    assert windows == [
+        {'text': "early", 'start': 0.0, 'duration': 10.0},
+        {'text': "late", 'start': 100.0, 'duration': 10.0},
+    ]
+
+
+def test_window_ends_with_its_longest_caption():
+    windows = compute_windows([caption("long", 0.0, 50.0), caption("short", 5.0, 1.0)], window_seconds=30.0)
+    assert windows == [{'text': "long short", 'start': 0.0, 'duration': 50.0}]
+
+
+def test_empty_and_invalid_arguments():
+    assert compute_windows([]) == []
+    with pytest.raises(ValueError):
+        compute_windows(CAPTIONS, window_seconds=0)
+    with pytest.raises(ValueError):
+        compute_windows(CAPTIONS, window_seconds=30.0, overlap_seconds=30.0)
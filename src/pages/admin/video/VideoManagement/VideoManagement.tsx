@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
 import { VideoList } from './components/VideoList';
 import { useBreadcrumbStore } from '@/store/breadcrumbStore';
 import { useToast } from '@/components/ui/use-toast';
@@ -7,6 +8,7 @@ export function VideoManagement() {
   const [videoUrl, setVideoUrl] = useState('');
   const [isProcessing, setIsProcessing] = useState(false);
   const { toast } = useToast();
+  const queryClient = useQueryClient();
   const setBreadcrumbs = useBreadcrumbStore((state) => state.setBreadcrumbs);
 
   useEffect(() => {
@@ -18,6 +20,24 @@ export function VideoManagement() {
     ]);
   }, [setBreadcrumbs]);
 
+  // Processing runs as a background job, poll it until it finishes
+  const waitForJob = async (jobId: string) => {
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const response = await fetch(`/api/videos/jobs/${jobId}`);
+      if (!response.ok) {
+        throw new Error('Failed to fetch processing status');
+      }
+      const job = await response.json();
+      if (job.status === 'completed') {
+        return job;
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Failed to process video');
+      }
+    }
+  };
+
   const handleVideoSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!videoUrl.trim()) return;
@@ -36,6 +56,11 @@ export function VideoManagement() {
         throw new Error(error.detail || 'Failed to process video');
       }
 
+      const { jobId } = await response.json();
+      queryClient.invalidateQueries({ queryKey: ['videos'] });
+      await waitForJob(jobId);
+      queryClient.invalidateQueries({ queryKey: ['videos'] });
+
       toast({
         title: "Success",
         description: "Video processed successfully",